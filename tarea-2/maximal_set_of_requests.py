@@ -1,3 +1,20 @@
+import bisect
+import heapq
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+from itertools import chain
+from operator import add
+
+import numpy as np
+
+# Cantidad de enteros de 64 bits que ocupa cada petición en los archivos de corridas: (final, inicio, índice)
+RECORD_SIZE = 3
+
+
 def merge_sort(lst, compare):
     """
     Esta función implementa el algoritmo de ordenamiento por mezcla (merge sort).
@@ -47,7 +64,94 @@ def merge(left, right, compare):
     return result
 
 
-def maximal_set_of_requests(n, p, t):
+def bottom_up_merge_sort(keys, ties=None):
+    """
+    Esta función ordena los índices de un arreglo de claves con un merge sort iterativo (de abajo hacia arriba).
+    A diferencia de merge_sort, no crea sublistas en cada nivel ni llama a una función de comparación: compara las
+    claves directamente y alterna entre dos arreglos de índices del mismo tamaño, reservados una sola vez. Las copias
+    de tramos completos se hacen entre vistas (memoryview) de los dos arreglos, sin crear listas temporales.
+
+    Parámetros:
+    keys (array): Las claves enteras de cada elemento.
+    ties (array): Claves enteras secundarias que deciden el orden cuando las claves son iguales. Si es None, los
+    empates conservan el orden de los índices.
+
+    Devuelve:
+    array: Los índices de 0 a n-1 ordenados de forma estable según sus claves (y sus claves secundarias).
+    """
+    if ties is None:
+        ties = keys
+    n = len(keys)
+    src = array('q', range(n))
+    dst = array('q', bytes(8 * n))
+    src_view, dst_view = memoryview(src), memoryview(dst)
+    width = 1
+    while width < n:
+        for lo in range(0, n, 2 * width):
+            mid = min(lo + width, n)
+            hi = min(lo + 2 * width, n)
+            # Si las dos mitades ya están en orden basta con copiarlas
+            if mid == hi or (keys[src[mid - 1]], ties[src[mid - 1]]) <= (keys[src[mid]], ties[src[mid]]):
+                dst_view[lo:hi] = src_view[lo:hi]
+                continue
+            # a y b son los primeros índices pendientes de cada mitad, y ka y kb sus claves
+            i, j, k = lo, mid, lo
+            a, b = src[i], src[j]
+            ka, kb = keys[a], keys[b]
+            while True:
+                if kb < ka or kb == ka and ties[b] < ties[a]:
+                    dst[k] = b
+                    k += 1
+                    j += 1
+                    if j == hi:
+                        break
+                    b = src[j]
+                    kb = keys[b]
+                else:
+                    dst[k] = a
+                    k += 1
+                    i += 1
+                    if i == mid:
+                        break
+                    a = src[i]
+                    ka = keys[a]
+            # Copia lo que quede de la mitad que no se agotó
+            if i < mid:
+                dst_view[k:hi] = src_view[i:mid]
+            else:
+                dst_view[k:hi] = src_view[j:hi]
+        src, dst = dst, src
+        src_view, dst_view = dst_view, src_view
+        width *= 2
+    return src
+
+
+def sort_by_end(n, p, t, timsort=False):
+    """
+    Esta función ordena los índices de las peticiones según su punto final y, en caso de empate, según su punto de
+    inicio, para que una petición de tamaño 0 quede después de las que terminan en su mismo punto. Los puntos
+    finales se calculan una sola vez en un arreglo compacto de enteros de 64 bits, sin pasar por una lista
+    intermedia; si algún punto no es entero o no cabe en 64 bits, se guardan en una lista.
+
+    Parámetros:
+    n (int): El número total de peticiones.
+    p (lista): Una lista de n números que representan el punto de inicio de cada petición.
+    t (lista): Una lista de n números que representan el tamaño de cada petición.
+    timsort (bool): Si es verdadero se usa el ordenamiento de Python (Timsort) en lugar de bottom_up_merge_sort.
+
+    Devuelve:
+    lista: Los índices de 0 a n-1 ordenados por punto final, luego por punto de inicio y luego por índice.
+    """
+    try:
+        ends = array('q', map(add, p, t))
+    except (TypeError, OverflowError):
+        ends = list(map(add, p, t))
+    if timsort:
+        return sorted(range(n), key=lambda i: (ends[i], p[i]))
+    return bottom_up_merge_sort(ends, p).tolist()
+
+
+def maximal_set_of_requests(n, p, t, timsort=False):
     """
     Esta función calcula el conjunto maximal de peticiones basado en los parámetros dados.
 
@@ -55,31 +159,17 @@ def maximal_set_of_requests(n, p, t):
     n (int): El número total de peticiones.
     p (lista): Una lista de enteros que representan el el punto de inicio de cada petición.
     t (lista): Una lista de enteros que representan el tamaño de cada petición.
+    timsort (bool): Si es verdadero las peticiones se ordenan con el ordenamiento de Python (Timsort).
 
     Devuelve:
     lista: Una lista de enteros que representa el conjunto maximal de peticiones.
     """
 
-    # Inicializa una lista con índices de 0 a n-1
-    o = [i for i in range(n)]
     # Inicializa una lista vacía para almacenar el conjunto máximo de peticiones
     perm = []
 
-    def compare_requests(i, j):
-        """
-        Esta función compara dos peticiones segun su punto final basándose en su punto de inicio y tamaño.
-
-        Parámetros:
-        i, j (int): Los índices de las dos peticiones a comparar.
-
-        Devuelve:
-        bool: Verdadero si el punto final de la petición i-ésima es menor o igual al punto final
-         de la petición j-ésima, Falso en caso contrario.
-        """
-        return p[i] + t[i] <= p[j] + t[j]
-
-    # Ordena la lista de índices basándose en la función de comparación
-    o = merge_sort(o, compare_requests)
+    # Ordena los índices de 0 a n-1 según el punto final de cada petición
+    o = sort_by_end(n, p, t, timsort)
 
     # Itera sobre la lista ordenada de índices
     for i in range(n):
@@ -87,9 +177,9 @@ def maximal_set_of_requests(n, p, t):
         rango_o_i = [p[o[i]], p[o[i]] + t[o[i]]]
 
         # Si la lista de peticiones maximal está vacía o el punto de inicio de la petición actual
-        # es mayor o igual al punto de inicio de la última petición en el conjunto maximal,
+        # es mayor o igual al punto final de la última petición en el conjunto maximal,
         # añade la petición actual al conjunto maximal
-        if len(perm) == 0 or rango_o_i[0] >= p[perm[-1]]:
+        if len(perm) == 0 or rango_o_i[0] >= p[perm[-1]] + t[perm[-1]]:
             perm.append(o[i])
 
     # Incrementa los índices en el conjunto maximal en 1 para que coincidan con los
@@ -99,3 +189,696 @@ def maximal_set_of_requests(n, p, t):
 
     # Devuelve el conjunto maximal de peticiones
     return perm
+
+
+def weighted_set_of_requests(n, p, t, w):
+    """
+    Esta función calcula el conjunto de peticiones compatibles de mayor peso total (weighted interval scheduling)
+    en tiempo O(n log n).
+
+    Parámetros:
+    n (int): El número total de peticiones.
+    p (lista): Una lista de enteros que representan el punto de inicio de cada petición.
+    t (lista): Una lista de enteros que representan el tamaño de cada petición.
+    w (lista): Una lista de números que representan el peso (prioridad) de cada petición.
+
+    Devuelve:
+    tupla: (peso, conjunto), donde peso es el mayor peso total alcanzable y conjunto es la lista de números de
+    petición (comenzando en 1) que lo alcanza, en orden de punto final.
+    """
+    # Ordena los índices por punto final y luego por punto de inicio
+    o = sort_by_end(n, p, t, timsort=True)
+    ends = [p[i] + t[i] for i in o]
+
+    # best[k] es el mayor peso alcanzable usando solo las primeras k peticiones en el orden o, y pred[k] es la
+    # cantidad de peticiones que terminan antes de que empiece la k-ésima, encontrada con búsqueda binaria
+    best = [0] * (n + 1)
+    pred = [0] * n
+    for k in range(n):
+        i = o[k]
+        pred[k] = bisect.bisect_right(ends, p[i], 0, k)
+        best[k + 1] = max(best[k], best[pred[k]] + w[i])
+
+    # Reconstruye el conjunto recorriendo las decisiones desde la última petición
+    chosen = []
+    k = n
+    while k > 0:
+        if best[k] == best[k - 1]:
+            k -= 1
+        else:
+            chosen.append(o[k - 1] + 1)
+            k = pred[k - 1]
+    chosen.reverse()
+
+    return best[n], chosen
+
+
+def partition_requests(n, p, t):
+    """
+    Esta función asigna todas las peticiones a la menor cantidad posible de servidores, de forma que las peticiones
+    de un mismo servidor no se solapen (interval partitioning). Las peticiones se recorren por punto de inicio (y
+    por punto final en caso de empate) y se mantiene un min-heap con el momento en que se libera cada servidor, lo
+    que toma O(n log n).
+
+    Parámetros:
+    n (int): El número total de peticiones.
+    p (lista): Una lista de enteros que representan el punto de inicio de cada petición.
+    t (lista): Una lista de enteros que representan el tamaño de cada petición.
+
+    Devuelve:
+    tupla: (servidores, cantidad), donde servidores[i] es el número de servidor (comenzando en 1) asignado a la
+    petición i + 1, y cantidad es el número de servidores usados, que es la mayor cantidad de peticiones que se
+    solapan en un mismo punto.
+    """
+    servers = [0] * n
+    # Cada entrada del heap es (momento en que se libera, número de servidor)
+    heap = []
+    # En caso de empate en el punto de inicio va primero la que termina antes, para que una petición de tamaño 0
+    # libere su servidor antes de que llegue una más larga que comienza en el mismo punto
+    for i in sorted(range(n), key=lambda i: (p[i], p[i] + t[i])):
+        # Si el servidor que se libera primero ya está libre se reutiliza, si no se abre uno nuevo
+        if heap and heap[0][0] <= p[i]:
+            server = heap[0][1]
+            heapq.heapreplace(heap, (p[i] + t[i], server))
+        else:
+            server = len(heap) + 1
+            heapq.heappush(heap, (p[i] + t[i], server))
+        servers[i] = server
+    return servers, len(heap)
+
+
+class SortedBuckets:
+    """
+    Clase para representar una lista ordenada dividida en bloques de tamaño acotado. Insertar y eliminar solo
+    desplaza los elementos de un bloque, por lo que cuesta O(log n + LOAD) en lugar de O(n).
+
+    Atributos:
+    buckets (lista): Los bloques, cada uno una lista ordenada no vacía; todos los elementos de un bloque son menores
+    que los del siguiente.
+    maxes (lista): El mayor elemento de cada bloque.
+    """
+    LOAD = 512
+
+    def __init__(self):
+        self.buckets = []
+        self.maxes = []
+
+    def insert(self, key):
+        """
+        Método para insertar un elemento manteniendo el orden.
+
+        Parámetros:
+        key: El elemento a insertar.
+        """
+        if not self.buckets:
+            self.buckets.append([key])
+            self.maxes.append(key)
+            return
+        b = min(bisect.bisect_left(self.maxes, key), len(self.buckets) - 1)
+        bucket = self.buckets[b]
+        bisect.insort(bucket, key)
+        self.maxes[b] = bucket[-1]
+        # Si el bloque creció demasiado se parte en dos
+        if len(bucket) > 2 * self.LOAD:
+            self.buckets[b:b + 1] = [bucket[:self.LOAD], bucket[self.LOAD:]]
+            self.maxes[b:b + 1] = [bucket[self.LOAD - 1], bucket[-1]]
+
+    def remove(self, key):
+        """
+        Método para eliminar un elemento presente en la lista.
+
+        Parámetros:
+        key: El elemento a eliminar.
+        """
+        b = bisect.bisect_left(self.maxes, key)
+        bucket = self.buckets[b]
+        del bucket[bisect.bisect_left(bucket, key)]
+        if bucket:
+            self.maxes[b] = bucket[-1]
+        else:
+            del self.buckets[b]
+            del self.maxes[b]
+
+    def predecessor(self, key):
+        """
+        Método para obtener el mayor elemento estrictamente menor que key.
+
+        Parámetros:
+        key: El elemento de referencia.
+
+        Retorna:
+        El mayor elemento menor que key, o None si no existe.
+        """
+        b = bisect.bisect_left(self.maxes, key)
+        if b < len(self.buckets):
+            i = bisect.bisect_left(self.buckets[b], key)
+            if i > 0:
+                return self.buckets[b][i - 1]
+        return self.maxes[b - 1] if b > 0 else None
+
+    def successor(self, key):
+        """
+        Método para obtener el menor elemento mayor o igual que key.
+
+        Parámetros:
+        key: El elemento de referencia.
+
+        Retorna:
+        El menor elemento mayor o igual que key, o None si no existe.
+        """
+        b = bisect.bisect_left(self.maxes, key)
+        if b == len(self.buckets):
+            return None
+        bucket = self.buckets[b]
+        return bucket[bisect.bisect_left(bucket, key)]
+
+    def __iter__(self):
+        return chain.from_iterable(self.buckets)
+
+
+class TreapNode:
+    """
+    Clase para representar un nodo de RequestTreap.
+
+    Atributos:
+    key (tupla): Clave (final, inicio, número) de la petición.
+    priority (float): Prioridad aleatoria; cada nodo tiene mayor prioridad que sus hijos.
+    max_start (int): Mayor punto de inicio de las peticiones del subárbol.
+    left (TreapNode): Subárbol con las claves menores.
+    right (TreapNode): Subárbol con las claves mayores.
+    """
+    __slots__ = ('key', 'priority', 'max_start', 'left', 'right')
+
+    def __init__(self, key):
+        self.key = key
+        self.priority = random.random()
+        self.max_start = key[1]
+        self.left = None
+        self.right = None
+
+    def update(self):
+        """
+        Método para recalcular max_start a partir de los hijos.
+        """
+        self.max_start = self.key[1]
+        if self.left is not None and self.left.max_start > self.max_start:
+            self.max_start = self.left.max_start
+        if self.right is not None and self.right.max_start > self.max_start:
+            self.max_start = self.right.max_start
+
+
+class RequestTreap:
+    """
+    Clase para representar un árbol binario de búsqueda aleatorizado (treap) de claves (final, inicio, número),
+    donde cada nodo guarda el mayor punto de inicio de su subárbol. Insertar, eliminar y buscar la primera petición
+    a partir de una clave que comienza en o después de un punto dado cuestan O(log n) en promedio.
+
+    Atributos:
+    root (TreapNode): Raíz del árbol, o None si está vacío.
+    """
+    def __init__(self):
+        self.root = None
+
+    def split(self, node, key):
+        """
+        Método para separar un subárbol en las claves menores que key y las mayores o iguales.
+
+        Parámetros:
+        node (TreapNode): Raíz del subárbol.
+        key (tupla): La clave de corte.
+
+        Retorna:
+        tupla: (menores, mayores o iguales), las raíces de los dos subárboles.
+        """
+        if node is None:
+            return None, None
+        if node.key < key:
+            node.right, right = self.split(node.right, key)
+            node.update()
+            return node, right
+        left, node.left = self.split(node.left, key)
+        node.update()
+        return left, node
+
+    def merge(self, left, right):
+        """
+        Método para unir dos subárboles, donde todas las claves de left son menores que las de right.
+
+        Parámetros:
+        left, right (TreapNode): Raíces de los subárboles.
+
+        Retorna:
+        TreapNode: La raíz del subárbol unido.
+        """
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            left.right = self.merge(left.right, right)
+            left.update()
+            return left
+        right.left = self.merge(left, right.left)
+        right.update()
+        return right
+
+    def insert(self, key):
+        """
+        Método para insertar una clave.
+
+        Parámetros:
+        key (tupla): La clave (final, inicio, número) a insertar.
+        """
+        left, right = self.split(self.root, key)
+        self.root = self.merge(self.merge(left, TreapNode(key)), right)
+
+    def remove(self, key):
+        """
+        Método para eliminar una clave presente en el árbol.
+
+        Parámetros:
+        key (tupla): La clave (final, inicio, número) a eliminar.
+        """
+        left, right = self.split(self.root, key)
+        # Los números de petición son únicos, así que la clave es la única menor que (final, inicio, número + 1)
+        _, right = self.split(right, (key[0], key[1], key[2] + 1))
+        self.root = self.merge(left, right)
+
+    def first_from(self, key, start):
+        """
+        Método para buscar la menor clave mayor o igual que key cuya petición comienza en o después de start.
+
+        Parámetros:
+        key (tupla): La menor clave permitida.
+        start (int): El menor punto de inicio permitido, o None para aceptar cualquiera.
+
+        Retorna:
+        tupla: La clave encontrada, o None si no existe.
+        """
+        return self.find(self.root, key, start)
+
+    def find(self, node, key, start):
+        """
+        Método auxiliar de first_from sobre el subárbol con raíz node. Los subárboles cuyo mayor punto de inicio es
+        menor que start se descartan sin recorrerlos, por lo que la búsqueda solo baja por el camino hacia key y
+        luego por un único camino hacia la respuesta.
+        """
+        if node is None or start is not None and node.max_start < start:
+            return None
+        if node.key < key:
+            return self.find(node.right, key, start)
+        found = self.find(node.left, key, start)
+        if found is not None:
+            return found
+        if start is None or node.key[1] >= start:
+            return node.key
+        return self.find(node.right, key, start)
+
+
+class DynamicScheduler:
+    """
+    Clase para mantener el conjunto maximal de peticiones mientras se agregan y cancelan peticiones, sin volver a
+    ordenar todo en cada cambio.
+
+    Las peticiones se guardan ordenadas por punto final, luego por punto de inicio y luego por número de petición,
+    como sort_by_end. Tras cada cambio solo se recalcula la selección voraz desde la posición afectada hasta que la
+    nueva cadena vuelve a coincidir con la anterior, y cada paso de la cadena se encuentra con una búsqueda en
+    RequestTreap, por lo que un cambio cuesta O(log n) por cada petición que entra o sale de la selección.
+
+    Atributos:
+    keys (RequestTreap): Claves (final, inicio, número) de todas las peticiones.
+    selected_keys (SortedBuckets): Claves de las peticiones del conjunto maximal.
+    selected (set): Números de las peticiones del conjunto maximal.
+    start (dict): Punto de inicio de cada petición según su número.
+    end (dict): Punto final de cada petición según su número.
+    next_id (int): Número que recibirá la próxima petición agregada.
+    """
+    def __init__(self):
+        self.keys = RequestTreap()
+        self.selected_keys = SortedBuckets()
+        self.selected = set()
+        self.start = {}
+        self.end = {}
+        self.next_id = 1
+
+    def add(self, start, size):
+        """
+        Método para agregar una petición.
+
+        Parámetros:
+        start (int): Punto de inicio de la petición.
+        size (int): Tamaño de la petición.
+
+        Retorna:
+        int: El número asignado a la petición, comenzando en 1.
+        """
+        request_id = self.next_id
+        self.next_id += 1
+        self.start[request_id] = start
+        self.end[request_id] = start + size
+        key = (start + size, start, request_id)
+        self.keys.insert(key)
+        # Si la selección voraz no toma la nueva petición, la selección no cambia
+        last = self.selected_keys.predecessor(key)
+        if last is None or start >= last[0]:
+            self.repair(key)
+        return request_id
+
+    def remove(self, request_id):
+        """
+        Método para cancelar una petición.
+
+        Parámetros:
+        request_id (int): El número de la petición a cancelar.
+        """
+        key = (self.end.pop(request_id), self.start.pop(request_id), request_id)
+        self.keys.remove(key)
+        # Una petición que no estaba seleccionada no influye en la selección voraz de las demás
+        if request_id in self.selected:
+            self.selected.remove(request_id)
+            self.selected_keys.remove(key)
+            self.repair(key)
+
+    def repair(self, key):
+        """
+        Método para recalcular la selección voraz a partir de la clave key. Cada petición de la nueva cadena es la
+        primera, en orden de clave, que comienza en o después del final de la anterior. Las peticiones de la cadena
+        anterior que quedan entre dos peticiones de la nueva se quitan de la selección, y la reparación se detiene
+        en cuanto la nueva cadena llega a una petición que ya estaba seleccionada, porque desde ahí ambas coinciden.
+
+        Parámetros:
+        key (tupla): La menor clave cuya decisión pudo haber cambiado.
+        """
+        last = self.selected_keys.predecessor(key)
+        last_end = None if last is None else last[0]
+        while True:
+            current = self.keys.first_from(key, last_end)
+            # Quita las peticiones de la cadena anterior que la nueva cadena salta
+            old = self.selected_keys.successor(key)
+            while old is not None and (current is None or old < current):
+                self.selected.remove(old[2])
+                self.selected_keys.remove(old)
+                old = self.selected_keys.successor(key)
+            if current is None or current[2] in self.selected:
+                return
+            self.selected.add(current[2])
+            self.selected_keys.insert(current)
+            last_end = current[0]
+            key = (current[0], current[1], current[2] + 1)
+
+    def selection(self):
+        """
+        Método para obtener el conjunto maximal actual.
+
+        Retorna:
+        lista: Los números de las peticiones del conjunto maximal, en orden de punto final.
+        """
+        return [request_id for _, _, request_id in self.selected_keys]
+
+
+def read_requests(path):
+    """
+    Esta función lee peticiones de un archivo de texto sin cargarlo completo en memoria.
+
+    Parámetros:
+    path (str): Ruta de un archivo con una petición por línea, en el formato "<inicio> <tamaño>".
+
+    Devuelve:
+    generador: Las peticiones del archivo como tuplas (inicio, tamaño), en el orden en que aparecen.
+    """
+    with open(path) as f:
+        for line in f:
+            fields = line.split()
+            # Las líneas vacías se ignoran
+            if fields:
+                yield int(fields[0]), int(fields[1])
+
+
+def write_run(records, directory):
+    """
+    Esta función escribe en disco una corrida ordenada de peticiones.
+
+    Parámetros:
+    records (iterable): Tuplas (final, inicio, índice) ya ordenadas.
+    directory (str): Directorio donde se crea el archivo de la corrida.
+
+    Devuelve:
+    str: La ruta del archivo creado.
+    """
+    fd, path = tempfile.mkstemp(suffix='.run', dir=directory)
+    with os.fdopen(fd, 'wb') as f:
+        array('q', chain.from_iterable(records)).tofile(f)
+    return path
+
+
+def read_run(path, block_size):
+    """
+    Esta función lee una corrida de disco por bloques de tamaño fijo.
+
+    Parámetros:
+    path (str): Ruta del archivo de la corrida.
+    block_size (int): Cantidad de peticiones que se leen de disco en cada bloque.
+
+    Devuelve:
+    generador: Las tuplas (final, inicio, índice) de la corrida en orden.
+    """
+    with open(path, 'rb') as f:
+        while True:
+            block = array('q')
+            try:
+                block.fromfile(f, block_size * RECORD_SIZE)
+            except EOFError:
+                # fromfile conserva los elementos que alcanzó a leer antes del final del archivo
+                pass
+            for k in range(0, len(block), RECORD_SIZE):
+                yield block[k], block[k + 1], block[k + 2]
+            if len(block) < block_size * RECORD_SIZE:
+                return
+
+
+def merge_runs(paths, directory, block_size, fan_in):
+    """
+    Esta función mezcla k corridas ordenadas a la vez (k-way merge) hasta que quedan a lo sumo `fan_in`, y
+    devuelve la mezcla final como un generador.
+
+    Parámetros:
+    paths (lista): Las rutas de las corridas ordenadas.
+    directory (str): Directorio donde se escriben las corridas intermedias.
+    block_size (int): Cantidad de peticiones por bloque de lectura y escritura.
+    fan_in (int): Cantidad máxima de corridas abiertas al mismo tiempo.
+
+    Devuelve:
+    generador: Todas las tuplas (final, inicio, índice) ordenadas por punto final, inicio e índice.
+    """
+    # Mientras haya más corridas que el máximo permitido, se mezclan por grupos en corridas más largas
+    while len(paths) > fan_in:
+        merged = []
+        for k in range(0, len(paths), fan_in):
+            group = paths[k:k + fan_in]
+            fd, path = tempfile.mkstemp(suffix='.run', dir=directory)
+            with os.fdopen(fd, 'wb') as f:
+                buffer = array('q')
+                for record in heapq.merge(*(read_run(g, block_size) for g in group)):
+                    buffer.extend(record)
+                    if len(buffer) >= block_size * RECORD_SIZE:
+                        buffer.tofile(f)
+                        buffer = array('q')
+                buffer.tofile(f)
+            for g in group:
+                os.remove(g)
+            merged.append(path)
+        paths = merged
+    return heapq.merge(*(read_run(path, block_size) for path in paths))
+
+
+def maximal_set_of_requests_stream(requests, run_size=1 << 18, fan_in=64, block_size=1 << 13, directory=None):
+    """
+    Esta función calcula el conjunto maximal de peticiones con memoria acotada, sin importar la cantidad de
+    peticiones. Las peticiones se ordenan por punto final con un ordenamiento externo: se forman corridas de a lo
+    sumo `run_size` peticiones que se ordenan en memoria y se escriben en disco, y luego se mezclan de a `fan_in`
+    corridas a la vez.
+
+    Parámetros:
+    requests (iterable o str): Un iterable de tuplas (inicio, tamaño), o la ruta de un archivo con el formato
+    aceptado por read_requests.
+    run_size (int): Cantidad máxima de peticiones que se ordenan en memoria en cada corrida.
+    fan_in (int): Cantidad máxima de corridas que se mezclan al mismo tiempo.
+    block_size (int): Cantidad de peticiones por bloque de lectura y escritura en disco.
+    directory (str): Directorio donde se crean los archivos temporales. Si es None, se usa el del sistema.
+
+    Devuelve:
+    generador: Los números de las peticiones del conjunto maximal (comenzando en 1), en orden de punto final.
+    """
+    if isinstance(requests, (str, os.PathLike)):
+        requests = read_requests(requests)
+
+    with tempfile.TemporaryDirectory(dir=directory) as tmp:
+        paths = []
+        run = []
+        for i, (start, size) in enumerate(requests):
+            # Se ordena por punto final, luego por punto de inicio y luego por índice, igual que sort_by_end
+            run.append((start + size, start, i))
+            if len(run) == run_size:
+                run.sort()
+                paths.append(write_run(run, tmp))
+                run = []
+        run.sort()
+
+        # Si todas las peticiones cupieron en una sola corrida no hace falta escribir en disco
+        if not paths:
+            ordered = iter(run)
+        else:
+            if run:
+                paths.append(write_run(run, tmp))
+            run = None
+            ordered = merge_runs(paths, tmp, block_size, fan_in)
+
+        # Selección voraz: se toma cada petición que comienza después de que termina la última seleccionada
+        last_end = None
+        for end, start, i in ordered:
+            if last_end is None or start >= last_end:
+                last_end = end
+                yield i + 1
+
+
+def pack_instances(instances):
+    """
+    Esta función empaqueta varias instancias del problema en arreglos planos de NumPy.
+
+    Parámetros:
+    instances (lista): Una lista de pares (p, t), uno por instancia, con las listas de puntos de inicio y tamaños.
+
+    Devuelve:
+    tupla: (offsets, p, t), donde las peticiones de la instancia k ocupan las posiciones
+    [offsets[k], offsets[k + 1]) de los arreglos planos p y t.
+    """
+    sizes = [len(p_k) for p_k, _ in instances]
+    offsets = np.zeros(len(instances) + 1, dtype=np.int64)
+    np.cumsum(sizes, out=offsets[1:])
+    p = np.fromiter(chain.from_iterable(p_k for p_k, _ in instances), dtype=np.int64, count=offsets[-1])
+    t = np.fromiter(chain.from_iterable(t_k for _, t_k in instances), dtype=np.int64, count=offsets[-1])
+    return offsets, p, t
+
+
+def maximal_set_of_requests_batch(offsets, p, t):
+    """
+    Esta función calcula el conjunto maximal de peticiones de muchas instancias a la vez. Todas las instancias se
+    ordenan por punto final con un único lexsort y la selección voraz recorre los arreglos empaquetados de una
+    sola pasada, sin el costo de preparación por instancia de maximal_set_of_requests.
+
+    Parámetros:
+    offsets (arreglo): Arreglo de m + 1 enteros; las peticiones de la instancia k ocupan las posiciones
+    [offsets[k], offsets[k + 1]) de p y t.
+    p (arreglo): Los puntos de inicio de todas las peticiones, instancia tras instancia.
+    t (arreglo): Los tamaños de todas las peticiones, instancia tras instancia.
+
+    Devuelve:
+    tupla: (sel_offsets, sel), donde sel[sel_offsets[k]:sel_offsets[k + 1]] es el conjunto maximal de la
+    instancia k, con los números de petición (comenzando en 1) relativos a esa instancia.
+    """
+    offsets = np.asarray(offsets, dtype=np.int64)
+    p = np.asarray(p, dtype=np.int64)
+    end = p + np.asarray(t, dtype=np.int64)
+    m = len(offsets) - 1
+    total = int(offsets[-1])
+
+    # Instancia a la que pertenece cada petición y su índice dentro de la instancia
+    sizes = np.diff(offsets)
+    instance = np.repeat(np.arange(m, dtype=np.int64), sizes)
+    local = np.arange(total, dtype=np.int64) - np.repeat(offsets[:-1], sizes)
+
+    # Ordena por instancia, luego por punto final, por punto de inicio y por índice, igual que sort_by_end. Como la
+    # instancia es la clave principal, cada instancia conserva su rango [offsets[k], offsets[k + 1])
+    order = np.lexsort((local, p, end, instance))
+
+    # Marca la primera petición de cada instancia no vacía, donde la selección voraz comienza de nuevo
+    first = np.zeros(total, dtype=bool)
+    first[offsets[:-1][sizes > 0]] = True
+
+    # Selección voraz sobre los arreglos empaquetados
+    chosen = []
+    last_end = 0
+    for pos, (start_i, end_i, first_i) in enumerate(zip(p[order].tolist(), end[order].tolist(), first.tolist())):
+        if first_i or start_i >= last_end:
+            last_end = end_i
+            chosen.append(pos)
+
+    chosen = np.asarray(chosen, dtype=np.int64)
+    sel_offsets = np.zeros(m + 1, dtype=np.int64)
+    np.cumsum(np.bincount(instance[chosen], minlength=m), out=sel_offsets[1:])
+    return sel_offsets, local[order][chosen] + 1
+
+
+def benchmark_batch(m=10000, size=20, seed=0):
+    """
+    Esta función compara maximal_set_of_requests_batch contra llamar a maximal_set_of_requests una vez por
+    instancia, sobre m instancias aleatorias de `size` peticiones, e imprime los tiempos.
+
+    Parámetros:
+    m (int): La cantidad de instancias.
+    size (int): La cantidad de peticiones por instancia.
+    seed (int): La semilla del generador aleatorio.
+    """
+    rng = random.Random(seed)
+    instances = [([rng.randint(0, 1000) for _ in range(size)], [rng.randint(1, 100) for _ in range(size)])
+                 for _ in range(m)]
+
+    begin = time.perf_counter()
+    expected = [maximal_set_of_requests(size, p_k, t_k) for p_k, t_k in instances]
+    loop_time = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    sel_offsets, sel = maximal_set_of_requests_batch(*pack_instances(instances))
+    batch_time = time.perf_counter() - begin
+
+    assert all(sel[sel_offsets[k]:sel_offsets[k + 1]].tolist() == expected[k] for k in range(m))
+    print(f"{m} instancias de {size} peticiones")
+    print(f"  ciclo por instancia: {loop_time:.3f} s")
+    print(f"  lote:                {batch_time:.3f} s ({loop_time / batch_time:.1f}x)")
+
+
+def benchmark_sorts(sizes=(10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7), max_merge_sort=10 ** 6, seed=0):
+    """
+    Esta función compara merge_sort con una función de comparación, bottom_up_merge_sort y Timsort al ordenar
+    peticiones por punto final, sobre entradas ordenadas, invertidas, aleatorias y con muchos puntos finales
+    repetidos, e imprime los tiempos.
+
+    Parámetros:
+    sizes (tupla): Las cantidades de peticiones a probar.
+    max_merge_sort (int): La mayor cantidad de peticiones con la que se prueba merge_sort, que es el más lento.
+    seed (int): La semilla del generador aleatorio.
+    """
+    rng = random.Random(seed)
+    for n in sizes:
+        inputs = {
+            'ordenada': list(range(n)),
+            'invertida': list(range(n, 0, -1)),
+            'aleatoria': [rng.randrange(n) for _ in range(n)],
+            'repetidos': [rng.randrange(16) for _ in range(n)],
+        }
+        for name, p in inputs.items():
+            t = [1] * n
+            print(f"n = {n}, entrada {name}")
+
+            begin = time.perf_counter()
+            expected = sort_by_end(n, p, t, timsort=True)
+            print(f"  timsort:              {time.perf_counter() - begin:.3f} s")
+
+            begin = time.perf_counter()
+            result = sort_by_end(n, p, t)
+            print(f"  bottom_up_merge_sort: {time.perf_counter() - begin:.3f} s")
+            assert result == expected
+
+            if n <= max_merge_sort:
+                begin = time.perf_counter()
+                result = merge_sort(list(range(n)), lambda i, j: (p[i] + t[i], p[i]) <= (p[j] + t[j], p[j]))
+                print(f"  merge_sort:           {time.perf_counter() - begin:.3f} s")
+                assert result == expected
+
+
+if __name__ == "__main__":
+    # Uso: python maximal_set_of_requests.py [batch | sort]
+    if len(sys.argv) > 1 and sys.argv[1] == "sort":
+        benchmark_sorts()
+    else:
+        benchmark_batch()
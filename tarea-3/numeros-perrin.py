@@ -1,32 +1,309 @@
-def perrin(n):
-    if n == 0:
-        return 3
-    if n == 1:
-        return 0
-    if n == 2:
-        return 2
-    else:
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from functools import lru_cache
+from math import isqrt
+from operator import mul
+
+# Tablas precalculadas cargadas con cargarTablaPerrin, que perrin consulta antes de calcular
+tablasPerrin = []
+
+# Encabezado de los archivos de tabla: firma, modulo (0 si los valores son exactos), N y posicion del indice
+ENCABEZADO = struct.Struct('<4sQQQ')
+FIRMA = b'PERR'
+
+
+def perrin(n, mod=None):
+    # P(n) = P(n - 2) + P(n - 3), con P(0) = 3, P(1) = 0, P(2) = 2
+    for tabla in tablasPerrin:
+        valor = tabla.buscar(n, mod)
+        if valor is not None:
+            return valor
+    return recurrenciaLineal([0, 1, 1], [3, 0, 2], n, mod)
+
+
+def padovan(n, mod=None):
+    # P(n) = P(n - 2) + P(n - 3), con P(0) = P(1) = P(2) = 1
+    return recurrenciaLineal([0, 1, 1], [1, 1, 1], n, mod)
+
+
+def fibonacci(n, mod=None):
+    # F(n) = F(n - 1) + F(n - 2), con F(0) = 0, F(1) = 1
+    return recurrenciaLineal([1, 1], [0, 1], n, mod)
+
+
+def tribonacci(n, mod=None):
+    # T(n) = T(n - 1) + T(n - 2) + T(n - 3), con T(0) = T(1) = 0, T(2) = 1
+    return recurrenciaLineal([1, 1, 1], [0, 0, 1], n, mod)
+
+
+def recurrenciaLineal(coef, iniciales, n, mod=None):
+    # Calcula a(n) para a(n) = coef[0] * a(n - 1) + ... + coef[k - 1] * a(n - k), dados a(0), ..., a(k - 1).
+    # Si mod no es None, todas las operaciones se hacen modulo mod.
+    if n < 0:
+        raise ValueError(f"n debe ser no negativo, se recibio {n}")
+    k = len(coef)
+    if n < k:
+        return iniciales[n] if mod is None else iniciales[n] % mod
+    v = iniciales[::-1]  # [a(k - 1), ..., a(0)]
+    r = matrizCompania(coef)
+    pr = potenciaMatriz(r, n - k + 1, mod)
+    resultado = sum(map(mul, pr[0], v))
+    return resultado if mod is None else resultado % mod
+
+
+def matrizCompania(coef):
+    # Matriz que lleva [a(n - 1), ..., a(n - k)] a [a(n), ..., a(n - k + 1)]
+    k = len(coef)
+    r = [[0] * k for _ in range(k)]
+    r[0] = list(coef)
+    for i in range(1, k):
+        r[i][i - 1] = 1
+    return r
+
+
+def potenciaMatriz(r, n, mod=None):
+    # Exponenciacion rapida iterativa: recorre los bits de n de menor a mayor
+    k = len(r)
+    resultado = [[int(i == j) for j in range(k)] for i in range(k)]
+    base = r
+    while n > 0:
+        if n & 1:
+            resultado = matrizMult(resultado, base, mod)
+        n >>= 1
+        if n > 0:
+            base = matrizMult(base, base, mod)
+    return resultado
+
+
+def matrizMult(r, s, mod=None):
+    columnas = list(zip(*s))
+    if mod is None:
+        return [[sum(map(mul, fila, col)) for col in columnas] for fila in r]
+    return [[sum(map(mul, fila, col)) % mod for col in columnas] for fila in r]
+
+
+def perrin_many(ns, mod=None):
+    # Evalua P(n) para cada n de ns. En lugar de elevar la matriz para cada indice, se aplican al vector
+    # [P(2), P(1), P(0)] las potencias R^(2^k) correspondientes a los bits de n - 2, que se guardan en un cache
+    # compartido entre llamadas. Cada bit cuesta un producto matriz-vector, O(k^2) en lugar de O(k^3).
+    coef = (0, 1, 1)
+    resultados = []
+    for n in ns:
+        if n < 3:
+            resultados.append(perrin(n, mod))
+            continue
         v = [2, 0, 3]  # [P(2), P(1), P(0)]
-        r = [[0, 1, 1], [1, 0, 0], [0, 1, 0]]
-        pr = potenciaMatrizDV(r, n - 2)
-        return matrizMult3x3(pr, v)
+        e = n - 2
+        k = 0
+        while e > 0:
+            if e & 1:
+                v = matrizVectorMult(potenciaDosCompania(coef, k, mod), v, mod)
+            e >>= 1
+            k += 1
+        resultados.append(v[0])
+    return resultados
 
 
-def potenciaMatrizDV(r, n):
-    if n == 1:
-        return r
-    pr = potenciaMatrizDV(r, n // 2)
-    if n % 2 == 0:
-        return matrizMult3x3(pr, pr)
+@lru_cache(maxsize=256)
+def potenciaDosCompania(coef, k, mod=None):
+    # R^(2^k) para la matriz compania de coef, como tupla de tuplas para que sea inmutable dentro del cache
+    if k == 0:
+        r = matrizCompania(coef)
     else:
-        return matrizMult3x3(r, matrizMult3x3(pr, pr))
+        pr = potenciaDosCompania(coef, k - 1, mod)
+        r = matrizMult(pr, pr, mod)
+    return tuple(map(tuple, r))
+
+
+def matrizVectorMult(r, v, mod=None):
+    if mod is None:
+        return [sum(map(mul, fila, v)) for fila in r]
+    return [sum(map(mul, fila, v)) % mod for fila in r]
+
+
+def perrin_cache_stats():
+    # Aciertos, fallos y tamano del cache de potencias usado por perrin_many
+    info = potenciaDosCompania.cache_info()
+    return {'hits': info.hits, 'misses': info.misses, 'size': info.currsize, 'maxsize': info.maxsize}
+
+
+def cribaSegmentada(lo, hi):
+    # es_primo[i] indica si lo + i es primo, para lo <= lo + i < hi
+    es_primo = bytearray([1]) * (hi - lo)
+    for n in range(lo, min(hi, 2)):
+        es_primo[n - lo] = 0
+    limite = isqrt(max(hi - 1, 0))
+    base = bytearray([1]) * (limite + 1)
+    for p in range(2, limite + 1):
+        if base[p]:
+            base[p * p::p] = bytes(len(range(p * p, limite + 1, p)))
+            inicio = max(p * p, (lo + p - 1) // p * p)
+            es_primo[inicio - lo::p] = bytes(len(range(inicio, hi, p)))
+    return es_primo
+
+
+def bloquePseudoprimos(lo, hi):
+    # Aplica la prueba de Perrin (n divide a P(n)) a cada n de [lo, hi) y separa los compuestos que la pasan
+    es_primo = cribaSegmentada(lo, hi)
+    candidatos = [n for n in range(max(lo, 2), hi) if perrin(n, n) == 0]
+    pseudoprimos = [n for n in candidatos if not es_primo[n - lo]]
+    return lo, candidatos, pseudoprimos
+
+
+def perrin_pseudoprimes(lo, hi, bloque=10000, procesos=None, checkpoint=None):
+    # Recorre [lo, hi) en bloques repartidos en un pool de procesos y produce (n, es_pseudoprimo) para cada n que
+    # pasa la prueba de Perrin, a medida que termina cada bloque. Si se indica un archivo checkpoint, en el se guarda
+    # el inicio del primer bloque sin terminar, y una nueva llamada con los mismos lo, hi y bloque continua desde
+    # ahi. Los bloques que terminaron despues de ese punto antes de una interrupcion se vuelven a reportar.
+    inicio = lo
+    if checkpoint is not None and os.path.exists(checkpoint):
+        with open(checkpoint) as f:
+            estado = json.load(f)
+        if (estado['lo'], estado['hi'], estado['bloque']) == (lo, hi, bloque):
+            inicio = estado['siguiente']
+
+    pendientes = iter(range(inicio, hi, bloque))
+    terminados = set()
+    siguiente = inicio
+    procesos = procesos or os.cpu_count() or 1
+    with ProcessPoolExecutor(procesos) as pool:
+        # Se mantienen a lo sumo 4 bloques por proceso en vuelo para no crear un futuro por cada bloque del rango
+        en_vuelo = set()
+        for b in pendientes:
+            en_vuelo.add(pool.submit(bloquePseudoprimos, b, min(b + bloque, hi)))
+            if len(en_vuelo) >= 4 * procesos:
+                break
+        while en_vuelo:
+            listos, en_vuelo = wait(en_vuelo, return_when=FIRST_COMPLETED)
+            for futuro in listos:
+                b, candidatos, pseudoprimos = futuro.result()
+                compuestos = set(pseudoprimos)
+                for n in candidatos:
+                    yield n, n in compuestos
+                terminados.add(b)
+                b = next(pendientes, None)
+                if b is not None:
+                    en_vuelo.add(pool.submit(bloquePseudoprimos, b, min(b + bloque, hi)))
+
+            # Avanza el checkpoint hasta el primer bloque que todavia no termina
+            avance = siguiente
+            while avance in terminados:
+                terminados.remove(avance)
+                avance += bloque
+            if checkpoint is not None and avance != siguiente:
+                guardarCheckpoint(checkpoint, {'lo': lo, 'hi': hi, 'bloque': bloque, 'siguiente': min(avance, hi)})
+            siguiente = avance
+
+
+def guardarCheckpoint(ruta, estado):
+    # Escribe en un archivo temporal y lo renombra para que el checkpoint nunca quede a medio escribir
+    temporal = ruta + '.tmp'
+    with open(temporal, 'w') as f:
+        json.dump(estado, f)
+    os.replace(temporal, ruta)
+
+
+def escribirLittleEndian(arreglo, f):
+    # Escribe un array('Q') en little-endian, como el encabezado, sin importar el orden de bytes de la maquina.
+    # En maquinas big-endian invierte los bytes del arreglo, que ya no se vuelve a usar.
+    if sys.byteorder == 'big':
+        arreglo.byteswap()
+    arreglo.tofile(f)
+
+
+def generarTablaPerrin(ruta, N, mod=None):
+    # Escribe P(0), ..., P(N) en un archivo binario con una sola pasada de P(n) = P(n - 2) + P(n - 3), sin
+    # guardar la secuencia en memoria. Con mod (0 < mod < 2^64, porque el encabezado lo guarda en 8 bytes y 0
+    # indica una tabla exacta) cada valor ocupa 8 bytes; sin mod los valores exactos se guardan uno tras otro y al
+    # final va un indice con la posicion de cada uno.
+    if mod is not None and not 0 < mod < 1 << 64:
+        raise ValueError(f"El modulo debe cumplir 0 < mod < 2^64, se recibio {mod}")
+    with open(ruta, 'wb') as f:
+        f.write(ENCABEZADO.pack(FIRMA, mod or 0, N, 0))
+        posiciones = array('Q', [ENCABEZADO.size])
+        buffer = array('Q')
+        a, b, c = 3, 0, 2  # P(n), P(n + 1), P(n + 2)
+        if mod is not None:
+            a, b, c = a % mod, b % mod, c % mod
+        for n in range(N + 1):
+            if mod is None:
+                datos = a.to_bytes((a.bit_length() + 7) // 8, 'little')
+                f.write(datos)
+                posiciones.append(posiciones[-1] + len(datos))
+            else:
+                buffer.append(a)
+                if len(buffer) == 1 << 16:
+                    escribirLittleEndian(buffer, f)
+                    buffer = array('Q')
+            d = a + b if mod is None else (a + b) % mod  # P(n + 3)
+            a, b, c = b, c, d
+        if mod is None:
+            indice = f.tell()
+            escribirLittleEndian(posiciones, f)
+            f.seek(0)
+            f.write(ENCABEZADO.pack(FIRMA, 0, N, indice))
+        else:
+            escribirLittleEndian(buffer, f)
+
+
+class TablaPerrin:
+    # Tabla de P(0), ..., P(N) escrita por generarTablaPerrin, leida con mmap: cada consulta lee solo los bytes
+    # del valor pedido y el sistema operativo decide que paginas mantener en memoria.
+    def __init__(self, ruta):
+        with open(ruta, 'rb') as f:
+            self.mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        firma, self.mod, self.N, self.indice = ENCABEZADO.unpack_from(self.mm, 0)
+        if firma != FIRMA:
+            raise ValueError(f"{ruta} no es una tabla de numeros de Perrin")
+
+    def __getitem__(self, n):
+        if not 0 <= n <= self.N:
+            raise IndexError(f"La tabla solo contiene P(0), ..., P({self.N})")
+        if self.mod:
+            return struct.unpack_from('<Q', self.mm, ENCABEZADO.size + 8 * n)[0]
+        inicio, fin = struct.unpack_from('<QQ', self.mm, self.indice + 8 * n)
+        return int.from_bytes(self.mm[inicio:fin], 'little')
+
+    def buscar(self, n, mod=None):
+        # P(n) mod mod si la tabla lo puede responder, o None si no. Una tabla exacta responde cualquier modulo, y
+        # una tabla modulo m responde los modulos que dividen a m.
+        if not 0 <= n <= self.N:
+            return None
+        if not self.mod:
+            return self[n] if mod is None else self[n] % mod
+        if mod is not None and self.mod % mod == 0:
+            return self[n] % mod
+        return None
+
+    def close(self):
+        self.mm.close()
+
+
+def cargarTablaPerrin(ruta):
+    # Abre una tabla y la registra para que perrin la consulte antes de calcular
+    tabla = TablaPerrin(ruta)
+    tablasPerrin.append(tabla)
+    return tabla
+
 
+def main():
+    # Uso: python numeros-perrin.py <lo> <hi> [checkpoint]
+    if len(sys.argv) < 3:
+        print("Uso: python numeros-perrin.py <lo> <hi> [checkpoint]")
+        return
+    lo, hi = int(sys.argv[1]), int(sys.argv[2])
+    checkpoint = sys.argv[3] if len(sys.argv) > 3 else None
+    for n, es_pseudoprimo in perrin_pseudoprimes(lo, hi, checkpoint=checkpoint):
+        if es_pseudoprimo:
+            print(f"{n} es pseudoprimo de Perrin")
+        else:
+            print(f"{n} pasa la prueba de Perrin")
 
-def matrizMult3x3(r, s):
-    t = [[0, 0, 0], [0, 0, 0], [0, 0, 0]]
-    for i in range(3):
-        for j in range(3):
-            for k in range(3):
-                t[i][j] += r[i][k] * s[k][j]
-    return t
 
+if __name__ == "__main__":
+    main()
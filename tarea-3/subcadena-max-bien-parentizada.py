@@ -1,3 +1,15 @@
+import mmap
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+# Bytes de espacio en blanco, que los constructores a partir de texto ignoran
+WHITESPACE = np.frombuffer(b' \t\n\r\v\f', dtype=np.uint8)
+
+
 class Node:
     """
     Clase para representar un nodo en el árbol de segmentos.
@@ -25,9 +37,12 @@ class SegmentTreeSubStringMaxBP:
 
     Atributos:
     root (Node): Nodo raíz del árbol de segmentos.
+    backend (objeto): Estructura alternativa que responde las consultas en lugar de los nodos, por ejemplo un
+    ArraySegmentTreeMaxBP. Si es None se usa el árbol de nodos.
     """
-    def __init__(self, root):
+    def __init__(self, root=None, backend=None):
         self.root = root
+        self.backend = backend
 
     def build(self, S, i, j):
         """
@@ -88,6 +103,43 @@ class SegmentTreeSubStringMaxBP:
         else:
             return 0
 
+    def update(self, pos, ch):
+        """
+        Método para reemplazar el carácter en la posición pos y actualizar los nodos del camino de la hoja a la
+        raíz, en tiempo O(log n).
+
+        Parámetros:
+        pos (int): Posición del carácter a reemplazar.
+        ch (str): El nuevo carácter, '(' o ')'.
+        """
+        if self.backend is not None:
+            self.backend.update(pos, ch)
+        else:
+            self.update_node(self.root, pos, ch)
+
+    def update_node(self, node, pos, ch):
+        """
+        Método recursivo para actualizar el subárbol de node tras reemplazar el carácter en la posición pos.
+
+        Parámetros:
+        node (Node): Nodo actual, cuyo rango contiene a pos.
+        pos (int): Posición del carácter a reemplazar.
+        ch (str): El nuevo carácter, '(' o ')'.
+        """
+        if not node.begin <= pos <= node.end:
+            raise IndexError(f"La posición {pos} no está dentro del rango [{node.begin}, {node.end}]")
+        if node.begin == node.end:
+            node.PAR, node.PCR = (1, 0) if ch == '(' else (0, 1)
+            return
+        mid = (node.begin + node.end) // 2
+        if pos <= mid:
+            self.update_node(node.left, pos, ch)
+        else:
+            self.update_node(node.right, pos, ch)
+        minPAR_PCR = min(node.left.PAR, node.right.PCR)
+        node.PAR = node.left.PAR + node.right.PAR - minPAR_PCR
+        node.PCR = node.left.PCR + node.right.PCR - minPAR_PCR
+
     def maxBP(self, i, j):
         """
         Método para obtener la longitud de la subcadena bien parentizada más larga en el rango [i, j].
@@ -99,13 +151,741 @@ class SegmentTreeSubStringMaxBP:
         Retorna:
         int: Longitud de la subcadena bien parentizada más larga en el rango.
         """
+        if self.backend is not None:
+            return self.backend.maxBP(i, j)
         (PAR, PCR) = self.query(self.root, i, j)
         return j - i + 1 - PAR - PCR
 
-# Ejemplo de uso
-S = "())(())(())("
-tree = SegmentTreeSubStringMaxBP(None)
-tree.root = tree.build(S, 0, len(S) - 1)
-result = tree.maxBP(2, 9)
-print(result)  # Imprime: 6
+    def maxBP_batch(self, I, J):
+        """
+        Método para responder muchas consultas maxBP a la vez. Si el backend lo permite, las consultas se resuelven
+        con operaciones vectorizadas; con el árbol de nodos se responden una por una.
+
+        Parámetros:
+        I (np.ndarray): Índices de inicio de los rangos (o cualquier secuencia que acepte np.asarray).
+        J (np.ndarray): Índices de fin de los rangos (o cualquier secuencia que acepte np.asarray).
+
+        Retorna:
+        np.ndarray: Arreglo de enteros con la respuesta de cada consulta.
+        """
+        if self.backend is not None:
+            return self.backend.maxBP_batch(I, J)
+        I = np.asarray(I, dtype=np.int64)
+        J = np.asarray(J, dtype=np.int64)
+        return np.fromiter((self.maxBP(i, j) for i, j in zip(I.tolist(), J.tolist())), dtype=np.int64, count=len(I))
+
+
+def merge(left, right):
+    """
+    Función para combinar los valores (PAR, PCR) de dos rangos consecutivos.
+
+    Parámetros:
+    left (tuple): Valores (PAR, PCR) del rango izquierdo.
+    right (tuple): Valores (PAR, PCR) del rango derecho.
+
+    Retorna:
+    tuple: Valores (PAR, PCR) del rango que resulta de unir ambos.
+    """
+    minPAR_PCR = min(left[0], right[1])
+    return left[0] + right[0] - minPAR_PCR, left[1] + right[1] - minPAR_PCR
+
+
+def opens(block):
+    """
+    Función para clasificar un bloque de bytes leído de un archivo o buffer como hojas. Los espacios en blanco, como
+    los saltos de línea, se ignoran; '(' es un paréntesis que abre y cualquier otro byte cuenta como un paréntesis
+    que cierra.
+
+    Parámetros:
+    block (objeto con protocolo de buffer): Bytes a clasificar.
+
+    Retorna:
+    np.ndarray: Arreglo booleano con un elemento por byte que no es espacio en blanco, verdadero si es '('.
+    """
+    block = np.frombuffer(block, dtype=np.uint8)
+    return block[~np.isin(block, WHITESPACE)] == ord('(')
+
+
+def fill_leaves(leaves, n, block):
+    """
+    Función para clasificar un bloque de bytes con opens y escribir sus hojas a partir de la posición n.
+
+    Parámetros:
+    leaves (np.ndarray): Arreglo de hojas donde se escribe.
+    n (int): Cantidad de hojas ya escritas.
+    block (memoryview): Bytes a clasificar.
+
+    Retorna:
+    int: Cantidad de hojas escritas después del bloque.
+    """
+    block = opens(block)
+    leaves[n:n + len(block)] = block
+    return n + len(block)
+
+
+def merge_batch(left_PAR, left_PCR, right_PAR, right_PCR):
+    """
+    Función para combinar, elemento a elemento, los valores (PAR, PCR) de muchos pares de rangos consecutivos.
+
+    Parámetros:
+    left_PAR, left_PCR (np.ndarray): Valores de los rangos izquierdos.
+    right_PAR, right_PCR (np.ndarray): Valores de los rangos derechos.
+
+    Retorna:
+    tuple: Arreglos con el PAR y el PCR de cada unión.
+    """
+    minPAR_PCR = np.minimum(left_PAR, right_PCR)
+    return left_PAR + right_PAR - minPAR_PCR, left_PCR + right_PCR - minPAR_PCR
+
+
+class ArraySegmentTreeMaxBP:
+    """
+    Clase para representar un árbol de segmentos iterativo guardado en arreglos planos, sin un objeto por nodo.
+
+    El nodo k tiene como hijos a los nodos 2k y 2k + 1, y las hojas son los nodos n, ..., 2n - 1. Las hojas no se
+    guardan como PAR/PCR sino como un byte por carácter, y los nodos internos 1, ..., n - 1 se guardan en dos
+    arreglos de enteros de 32 bits, por lo que el árbol ocupa cerca de 9 bytes por carácter.
+
+    from_string indexa la cadena igual que SegmentTreeSubStringMaxBP.build: cada carácter es una posición, '(' abre
+    y cualquier otro carácter cuenta como ')'. Los lectores de bytes, archivos y mmap (from_bytes, from_file y
+    from_mmap) además ignoran los espacios en blanco, como los saltos de línea, siguiendo la regla de opens, por lo
+    que sus posiciones no cuentan esos caracteres.
+
+    Atributos:
+    n (int): Longitud de la cadena.
+    leaves (np.ndarray): leaves[k] es 1 si el carácter k es un paréntesis que abre y 0 si cierra.
+    PAR (np.ndarray): PAR de cada nodo interno; la posición 0 no se usa.
+    PCR (np.ndarray): PCR de cada nodo interno; la posición 0 no se usa.
+    views (tuple): Vistas memoryview de leaves, PAR y PCR.
+    """
+    # Cantidad máxima de nodos de un nivel que build calcula a la vez
+    BUILD_CHUNK = 1 << 20
+
+    def __init__(self, leaves):
+        self.n = len(leaves)
+        self.leaves = np.asarray(leaves, dtype=np.uint8)
+        self.PAR = np.zeros(max(self.n, 1), dtype=np.int32)
+        self.PCR = np.zeros(max(self.n, 1), dtype=np.int32)
+        # Vistas de los arreglos para leer y escribir elementos sueltos como enteros de Python, sin crear escalares
+        # de NumPy en cada acceso
+        self.views = memoryview(self.leaves), memoryview(self.PAR), memoryview(self.PCR)
+        self.build()
+
+    @classmethod
+    def from_string(cls, S):
+        """
+        Método para construir el árbol a partir de una cadena de paréntesis.
+
+        Parámetros:
+        S (str): Cadena de paréntesis; cualquier carácter distinto de '(' cuenta como ')', como en build.
+
+        Retorna:
+        ArraySegmentTreeMaxBP: El árbol construido.
+        """
+        # Cada carácter que no es ASCII se reemplaza por un solo '?', por lo que las posiciones no cambian
+        return cls(np.frombuffer(S.encode('ascii', 'replace'), dtype=np.uint8) == ord('('))
+
+    @classmethod
+    def from_bytes(cls, data, chunk_size=1 << 24):
+        """
+        Método para construir el árbol a partir de un objeto de bytes (o cualquier objeto con protocolo de buffer)
+        sin decodificarlo como cadena. Los espacios en blanco, como los saltos de línea, se ignoran.
+
+        Parámetros:
+        data (bytes): Los paréntesis codificados en ASCII.
+        chunk_size (int): Cantidad de bytes que se clasifican a la vez.
+
+        Retorna:
+        ArraySegmentTreeMaxBP: El árbol construido.
+        """
+        data = memoryview(data).cast('B')
+        leaves = np.empty(len(data), dtype=np.uint8)
+        n = 0
+        for start in range(0, len(data), chunk_size):
+            n = fill_leaves(leaves, n, data[start:start + chunk_size])
+        return cls(leaves[:n])
+
+    @classmethod
+    def from_file(cls, path, chunk_size=1 << 24):
+        """
+        Método para construir el árbol leyendo un archivo por bloques de tamaño fijo, sin cargarlo completo en
+        memoria. Los espacios en blanco, como los saltos de línea, se ignoran.
+
+        Parámetros:
+        path (str): Ruta del archivo.
+        chunk_size (int): Cantidad de bytes que se leen y clasifican a la vez.
+
+        Retorna:
+        ArraySegmentTreeMaxBP: El árbol construido.
+        """
+        with open(path, 'rb') as f:
+            leaves = np.empty(os.fstat(f.fileno()).st_size, dtype=np.uint8)
+            buffer = bytearray(chunk_size)
+            n = 0
+            while True:
+                size = f.readinto(buffer)
+                if not size:
+                    break
+                n = fill_leaves(leaves, n, memoryview(buffer)[:size])
+        return cls(leaves[:n])
+
+    @classmethod
+    def from_mmap(cls, source, chunk_size=1 << 24):
+        """
+        Método para construir el árbol a partir de un archivo mapeado en memoria. El sistema operativo carga las
+        páginas a medida que se clasifican los bloques.
+
+        Parámetros:
+        source (mmap.mmap o str): Un mapa de memoria ya abierto, o la ruta de un archivo para mapear.
+        chunk_size (int): Cantidad de bytes que se clasifican a la vez.
+
+        Retorna:
+        ArraySegmentTreeMaxBP: El árbol construido.
+        """
+        if isinstance(source, mmap.mmap):
+            return cls.from_bytes(source, chunk_size)
+        with open(source, 'rb') as f:
+            # mmap no puede mapear archivos vacíos
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls(np.empty(0, dtype=np.uint8))
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return cls.from_bytes(mm, chunk_size)
+
+    def children(self, lo, hi):
+        """
+        Método para obtener los valores de los hijos de los nodos lo, ..., hi - 1, que son los nodos consecutivos
+        2 * lo, ..., 2 * hi - 1, ya sean internos u hojas.
+
+        Retorna:
+        tuple: Arreglos con el PAR y el PCR de los hijos, en orden.
+        """
+        n = self.n
+        a, b = 2 * lo, 2 * hi
+        par = np.concatenate((self.PAR[a:min(b, n)], self.leaves[max(a, n) - n:max(b, n) - n].astype(np.int32)))
+        pcr = np.concatenate((self.PCR[a:min(b, n)], 1 - par[max(min(b, n) - a, 0):]))
+        return par, pcr
+
+    def build(self):
+        """
+        Método para calcular los nodos internos de abajo hacia arriba, un nivel a la vez y con operaciones
+        vectorizadas sobre todo el nivel.
+        """
+        level = (self.n - 1).bit_length() - 1
+        while level >= 0:
+            # Los niveles grandes se procesan por tramos para que los arreglos temporales no crezcan con n
+            for lo in range(1 << level, min(1 << (level + 1), self.n), self.BUILD_CHUNK):
+                hi = min(lo + self.BUILD_CHUNK, 1 << (level + 1), self.n)
+                par, pcr = self.children(lo, hi)
+                minPAR_PCR = np.minimum(par[0::2], pcr[1::2])
+                self.PAR[lo:hi] = par[0::2] + par[1::2] - minPAR_PCR
+                self.PCR[lo:hi] = pcr[0::2] + pcr[1::2] - minPAR_PCR
+            level -= 1
+
+    def query(self, i, j):
+        """
+        Método iterativo para obtener los valores (PAR, PCR) del rango [i, j]. Sube desde las hojas acumulando por
+        separado lo que queda a la izquierda y a la derecha del rango, porque la combinación no es conmutativa.
+
+        Parámetros:
+        i (int): Índice de inicio del rango.
+        j (int): Índice de fin del rango.
+
+        Retorna:
+        tuple: Tupla con la cantidad de paréntesis abiertos y cerrados que no están bien parentizados en el rango.
+        """
+        n = self.n
+        if not 0 <= i <= j < n:
+            raise IndexError(f"El rango [{i}, {j}] no está dentro de los {n} caracteres de la cadena")
+        leaves, PAR, PCR = self.views
+        left, right = (0, 0), (0, 0)
+        lo, hi = i + n, j + n + 1
+        while lo < hi:
+            if lo & 1:
+                node = (leaves[lo - n], 1 - leaves[lo - n]) if lo >= n else (PAR[lo], PCR[lo])
+                left = merge(left, node)
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                node = (leaves[hi - n], 1 - leaves[hi - n]) if hi >= n else (PAR[hi], PCR[hi])
+                right = merge(node, right)
+            lo >>= 1
+            hi >>= 1
+        return merge(left, right)
+
+    def update(self, pos, ch):
+        """
+        Método para reemplazar el carácter en la posición pos y recalcular los nodos del camino de la hoja a la
+        raíz, en tiempo O(log n).
+
+        Parámetros:
+        pos (int): Posición del carácter a reemplazar.
+        ch (str): El nuevo carácter, '(' o ')'.
+        """
+        n = self.n
+        if not 0 <= pos < n:
+            raise IndexError(f"La posición {pos} no está dentro de los {n} caracteres de la cadena")
+        leaves, PAR, PCR = self.views
+        leaves[pos] = ch == '('
+        k = (pos + n) >> 1
+        while k >= 1:
+            lo, hi = 2 * k, 2 * k + 1
+            left = (leaves[lo - n], 1 - leaves[lo - n]) if lo >= n else (PAR[lo], PCR[lo])
+            right = (leaves[hi - n], 1 - leaves[hi - n]) if hi >= n else (PAR[hi], PCR[hi])
+            PAR[k], PCR[k] = merge(left, right)
+            k >>= 1
+
+    def nodes(self, k):
+        """
+        Método para obtener los valores de varios nodos a la vez, ya sean internos u hojas.
+
+        Parámetros:
+        k (np.ndarray): Índices de los nodos.
+
+        Retorna:
+        tuple: Arreglos con el PAR y el PCR de cada nodo.
+        """
+        n = self.n
+        leaf = k >= n
+        par = np.where(leaf, self.leaves[np.where(leaf, k - n, 0)], self.PAR[np.where(leaf, 0, k)]).astype(np.int64)
+        pcr = np.where(leaf, 1 - par, self.PCR[np.where(leaf, 0, k)])
+        return par, pcr
+
+    def maxBP_batch(self, I, J):
+        """
+        Método para responder muchas consultas maxBP a la vez. Aplica el recorrido iterativo de query a todas las
+        consultas juntas, un nivel del árbol a la vez, con operaciones vectorizadas.
+
+        Parámetros:
+        I (np.ndarray): Índices de inicio de los rangos.
+        J (np.ndarray): Índices de fin de los rangos.
+
+        Retorna:
+        np.ndarray: Arreglo de enteros con la respuesta de cada consulta.
+        """
+        I = np.asarray(I, dtype=np.int64)
+        J = np.asarray(J, dtype=np.int64)
+        lo, hi = I + self.n, J + self.n + 1
+        left_PAR, left_PCR = np.zeros_like(I), np.zeros_like(I)
+        right_PAR, right_PCR = np.zeros_like(I), np.zeros_like(I)
+        active = lo < hi
+        while active.any():
+            # Consultas cuyo extremo izquierdo es un hijo derecho: se acumula el nodo a la izquierda
+            m = np.flatnonzero(active & (lo & 1 == 1))
+            par, pcr = self.nodes(lo[m])
+            left_PAR[m], left_PCR[m] = merge_batch(left_PAR[m], left_PCR[m], par, pcr)
+            lo[m] += 1
+            # Consultas cuyo extremo derecho es un hijo derecho: se acumula el nodo anterior a la derecha
+            m = np.flatnonzero(active & (hi & 1 == 1))
+            hi[m] -= 1
+            par, pcr = self.nodes(hi[m])
+            right_PAR[m], right_PCR[m] = merge_batch(par, pcr, right_PAR[m], right_PCR[m])
+            lo >>= 1
+            hi >>= 1
+            active = lo < hi
+        PAR, PCR = merge_batch(left_PAR, left_PCR, right_PAR, right_PCR)
+        return J - I + 1 - PAR - PCR
+
+    def maxBP(self, i, j):
+        """
+        Método para obtener la longitud de la subcadena bien parentizada más larga en el rango [i, j].
+
+        Parámetros:
+        i (int): Índice de inicio del rango.
+        j (int): Índice de fin del rango.
+
+        Retorna:
+        int: Longitud de la subcadena bien parentizada más larga en el rango.
+        """
+        (PAR, PCR) = self.query(i, j)
+        return j - i + 1 - PAR - PCR
+
+
+class DisjointSparseTableMaxBP:
+    """
+    Clase para representar una tabla dispersa disjunta (disjoint sparse table) sobre una cadena de paréntesis que no
+    cambia. Responde cualquier rango con una sola combinación de dos valores precalculados, en O(1).
+
+    La cadena se rellena hasta una longitud potencia de dos, N. En el nivel h la cadena se divide en bloques de
+    2^(h + 1) caracteres con mitad en mid; para cada i de la mitad izquierda se guardan los valores (PAR, PCR) de
+    [i, mid - 1] y para cada j de la mitad derecha los de [mid, j]. Un rango [i, j] con i != j cruza la mitad de
+    exactamente un bloque, el del nivel del bit más alto de i XOR j. El preprocesamiento es O(N log N).
+
+    Atributos:
+    n (int): Longitud de la cadena.
+    leaves (np.ndarray): leaves[k] es 1 si el carácter k es un paréntesis que abre y 0 si cierra.
+    PAR (np.ndarray): Matriz de log N filas con el PAR de cada posición en cada nivel.
+    PCR (np.ndarray): Matriz de log N filas con el PCR de cada posición en cada nivel.
+    views (tuple): Vistas memoryview de leaves, PAR y PCR.
+    """
+    def __init__(self, leaves):
+        self.n = len(leaves)
+        self.leaves = np.asarray(leaves, dtype=np.uint8)
+        size = 1 << max((self.n - 1).bit_length(), 1)
+        levels = size.bit_length() - 1
+
+        # Balance de cada prefijo, sumando 1 por cada paréntesis que abre y restando 1 por cada uno que cierra. El
+        # relleno no importa porque ninguna consulta lo alcanza. Para un rango, PCR es lo que más baja el balance
+        # por debajo de su valor inicial y PAR es el balance final más PCR.
+        balance = np.zeros(size + 1, dtype=np.int64)
+        np.cumsum(2 * self.leaves.astype(np.int64) - 1, out=balance[1:self.n + 1])
+        balance[self.n + 1:] = balance[self.n]
+
+        self.PAR = np.empty((levels, size), dtype=np.int32)
+        self.PCR = np.empty((levels, size), dtype=np.int32)
+        for h in range(levels):
+            half = 1 << h
+            # after[b, 0, k] es el balance después del carácter k de la mitad izquierda del bloque b, y after[b, 1, k]
+            # el de la mitad derecha; before es el balance antes de cada carácter
+            after = balance[1:].reshape(-1, 2, half)
+            before = balance[:-1].reshape(-1, 2, half)
+            PAR = self.PAR[h].reshape(-1, 2, half)
+            PCR = self.PCR[h].reshape(-1, 2, half)
+
+            # Mitad izquierda: rangos [i, mid - 1], con mínimos acumulados de derecha a izquierda
+            lowest = np.minimum.accumulate(after[:, 0, ::-1], axis=1)[:, ::-1]
+            PCR[:, 0] = np.maximum(before[:, 0] - lowest, 0)
+            PAR[:, 0] = after[:, 0, -1:] - before[:, 0] + PCR[:, 0]
+
+            # Mitad derecha: rangos [mid, j], con mínimos acumulados de izquierda a derecha
+            lowest = np.minimum.accumulate(after[:, 1], axis=1)
+            PCR[:, 1] = np.maximum(before[:, 1, :1] - lowest, 0)
+            PAR[:, 1] = after[:, 1] - before[:, 1, :1] + PCR[:, 1]
+
+        self.views = memoryview(self.leaves), memoryview(self.PAR), memoryview(self.PCR)
+
+    @classmethod
+    def from_string(cls, S):
+        """
+        Método para construir la tabla a partir de una cadena de paréntesis.
+
+        Parámetros:
+        S (str): Cadena de paréntesis; cualquier carácter distinto de '(' cuenta como ')', como en build.
+
+        Retorna:
+        DisjointSparseTableMaxBP: La tabla construida.
+        """
+        # Cada carácter que no es ASCII se reemplaza por un solo '?', por lo que las posiciones no cambian
+        return cls(np.frombuffer(S.encode('ascii', 'replace'), dtype=np.uint8) == ord('('))
+
+    def query(self, i, j):
+        """
+        Método para obtener los valores (PAR, PCR) del rango [i, j] en O(1).
+
+        Parámetros:
+        i (int): Índice de inicio del rango.
+        j (int): Índice de fin del rango.
+
+        Retorna:
+        tuple: Tupla con la cantidad de paréntesis abiertos y cerrados que no están bien parentizados en el rango.
+        """
+        leaves, PAR, PCR = self.views
+        if i == j:
+            return leaves[i], 1 - leaves[i]
+        h = (i ^ j).bit_length() - 1
+        return merge((PAR[h, i], PCR[h, i]), (PAR[h, j], PCR[h, j]))
+
+    def update(self, pos, ch):
+        """
+        Método que rechaza los reemplazos de caracteres: la tabla se calcula una sola vez para una cadena que no
+        cambia, y actualizarla costaría O(n). Para cadenas que cambian se usa ArraySegmentTreeMaxBP.
+
+        Parámetros:
+        pos (int): Posición del carácter a reemplazar.
+        ch (str): El nuevo carácter, '(' o ')'.
+        """
+        raise TypeError("DisjointSparseTableMaxBP es de solo lectura; "
+                        "use ArraySegmentTreeMaxBP para reemplazar caracteres")
+
+    def maxBP_batch(self, I, J):
+        """
+        Método para responder muchas consultas maxBP a la vez, leyendo los dos valores de cada consulta con
+        operaciones vectorizadas.
+
+        Parámetros:
+        I (np.ndarray): Índices de inicio de los rangos.
+        J (np.ndarray): Índices de fin de los rangos.
+
+        Retorna:
+        np.ndarray: Arreglo de enteros con la respuesta de cada consulta.
+        """
+        I = np.asarray(I, dtype=np.int64)
+        J = np.asarray(J, dtype=np.int64)
+        # Nivel del bit más alto de I XOR J; frexp es exacto porque los índices caben en la mantisa de un double.
+        # Las consultas con I == J leen el nivel 0, que para un solo carácter no se usa
+        h = np.maximum(np.frexp((I ^ J).astype(np.float64))[1] - 1, 0)
+        PAR, PCR = self.PAR.ravel(), self.PCR.ravel()
+        size = self.PAR.shape[1]
+        PAR, PCR = merge_batch(PAR[h * size + I].astype(np.int64), PCR[h * size + I].astype(np.int64),
+                               PAR[h * size + J].astype(np.int64), PCR[h * size + J].astype(np.int64))
+        single = I == J
+        PAR[single] = self.leaves[I[single]]
+        PCR[single] = 1 - PAR[single]
+        return J - I + 1 - PAR - PCR
+
+    def maxBP(self, i, j):
+        """
+        Método para obtener la longitud de la subcadena bien parentizada más larga en el rango [i, j].
+
+        Parámetros:
+        i (int): Índice de inicio del rango.
+        j (int): Índice de fin del rango.
+
+        Retorna:
+        int: Longitud de la subcadena bien parentizada más larga en el rango.
+        """
+        (PAR, PCR) = self.query(i, j)
+        return j - i + 1 - PAR - PCR
+
+
+class AppendableMaxBP:
+    """
+    Clase para representar un árbol de segmentos sobre una cadena de paréntesis que crece por el final, por ejemplo
+    la salida de un tokenizador que lee el final de un log.
+
+    El árbol es completo sobre una capacidad C potencia de dos: el nodo k tiene como hijos a 2k y 2k + 1 y las hojas
+    son los nodos C, ..., 2C - 1. Las hojas que todavía no tienen carácter valen (0, 0), que es el neutro de la
+    combinación. Agregar un carácter solo escribe su hoja, en O(1); los nodos internos de las hojas nuevas se
+    recalculan juntos, nivel por nivel, en la siguiente consulta. Cuando la capacidad se agota se duplica: el árbol
+    anterior pasa a ser el subárbol izquierdo de la nueva raíz, copiando cada nivel en bloque, lo que cuesta O(1)
+    amortizado por carácter.
+
+    Atributos:
+    n (int): Cantidad de caracteres agregados.
+    pending (int): Posición de la primera hoja cuyos ancestros todavía no se han recalculado.
+    capacity (int): Cantidad de hojas del árbol.
+    PAR (np.ndarray): PAR de cada nodo; la posición 0 no se usa.
+    PCR (np.ndarray): PCR de cada nodo; la posición 0 no se usa.
+    views (tuple): Vistas memoryview de PAR y PCR.
+    """
+    def __init__(self, capacity=1024):
+        self.n = 0
+        self.pending = 0
+        self.capacity = 1 << max(capacity - 1, 0).bit_length()
+        self.PAR = np.zeros(2 * self.capacity, dtype=np.int32)
+        self.PCR = np.zeros(2 * self.capacity, dtype=np.int32)
+        self.views = memoryview(self.PAR), memoryview(self.PCR)
+
+    def __len__(self):
+        return self.n
+
+    def grow(self):
+        """
+        Método para duplicar la capacidad. El nivel d del árbol anterior, nodos 2^d, ..., 2^(d + 1) - 1, pasa a
+        ocupar los nodos 2^(d + 1), ..., 2^(d + 1) + 2^d - 1 del nuevo árbol, por lo que cada hoja conserva su
+        posición relativa.
+        """
+        capacity = 2 * self.capacity
+        PAR = np.zeros(2 * capacity, dtype=np.int32)
+        PCR = np.zeros(2 * capacity, dtype=np.int32)
+        size = 1
+        while size <= self.capacity:
+            PAR[2 * size:3 * size] = self.PAR[size:2 * size]
+            PCR[2 * size:3 * size] = self.PCR[size:2 * size]
+            size *= 2
+        # La nueva raíz combina el árbol anterior con un subárbol derecho vacío
+        PAR[1], PCR[1] = PAR[2], PCR[2]
+        self.capacity, self.PAR, self.PCR = capacity, PAR, PCR
+        self.views = memoryview(self.PAR), memoryview(self.PCR)
+
+    def append(self, ch):
+        """
+        Método para agregar un carácter al final de la cadena.
+
+        Parámetros:
+        ch (str): El carácter a agregar, '(' o ')'.
+        """
+        if self.n == self.capacity:
+            self.grow()
+        PAR, PCR = self.views
+        k = self.n + self.capacity
+        PAR[k], PCR[k] = (1, 0) if ch == '(' else (0, 1)
+        self.n += 1
+
+    def extend(self, S):
+        """
+        Método para agregar varios caracteres al final de la cadena. Si S es una cadena o un objeto de bytes, sus
+        hojas se escriben en bloque.
+
+        Parámetros:
+        S (iterable): Los caracteres a agregar, en orden.
+        """
+        if isinstance(S, str):
+            S = S.encode('ascii', 'replace')
+        if not isinstance(S, (bytes, bytearray, memoryview)):
+            for ch in S:
+                self.append(ch)
+            return
+        is_open = np.frombuffer(S, dtype=np.uint8) == ord('(')
+        while self.n + len(is_open) > self.capacity:
+            self.grow()
+        begin, end = self.capacity + self.n, self.capacity + self.n + len(is_open)
+        self.PAR[begin:end] = is_open
+        self.PCR[begin:end] = ~is_open
+        self.n += len(is_open)
+
+    def flush(self):
+        """
+        Método para recalcular los ancestros de las hojas agregadas desde la última consulta. En cada nivel esos
+        ancestros son un rango contiguo de nodos, que se recalcula con operaciones vectorizadas.
+        """
+        if self.pending == self.n:
+            return
+        lo, hi = self.pending + self.capacity, self.n - 1 + self.capacity
+        while lo > 1:
+            lo, hi = lo >> 1, hi >> 1
+            left_PAR, right_PAR = self.PAR[2 * lo:2 * hi + 2:2], self.PAR[2 * lo + 1:2 * hi + 2:2]
+            left_PCR, right_PCR = self.PCR[2 * lo:2 * hi + 2:2], self.PCR[2 * lo + 1:2 * hi + 2:2]
+            minPAR_PCR = np.minimum(left_PAR, right_PCR)
+            self.PAR[lo:hi + 1] = left_PAR + right_PAR - minPAR_PCR
+            self.PCR[lo:hi + 1] = left_PCR + right_PCR - minPAR_PCR
+        self.pending = self.n
+
+    def query(self, i, j):
+        """
+        Método iterativo para obtener los valores (PAR, PCR) del rango [i, j] de lo agregado hasta ahora.
+
+        Parámetros:
+        i (int): Índice de inicio del rango.
+        j (int): Índice de fin del rango.
+
+        Retorna:
+        tuple: Tupla con la cantidad de paréntesis abiertos y cerrados que no están bien parentizados en el rango.
+        """
+        if not 0 <= i <= j < self.n:
+            raise IndexError(f"El rango [{i}, {j}] no está dentro de los {self.n} caracteres agregados")
+        self.flush()
+        PAR, PCR = self.views
+        left, right = (0, 0), (0, 0)
+        lo, hi = i + self.capacity, j + self.capacity + 1
+        while lo < hi:
+            if lo & 1:
+                left = merge(left, (PAR[lo], PCR[lo]))
+                lo += 1
+            if hi & 1:
+                hi -= 1
+                right = merge((PAR[hi], PCR[hi]), right)
+            lo >>= 1
+            hi >>= 1
+        return merge(left, right)
+
+    def maxBP(self, i, j):
+        """
+        Método para obtener la longitud de la subcadena bien parentizada más larga en el rango [i, j].
+
+        Parámetros:
+        i (int): Índice de inicio del rango.
+        j (int): Índice de fin del rango.
+
+        Retorna:
+        int: Longitud de la subcadena bien parentizada más larga en el rango.
+        """
+        (PAR, PCR) = self.query(i, j)
+        return j - i + 1 - PAR - PCR
+
+
+def benchmark_updates(n=10 ** 6, ops=10 ** 6, seed=0):
+    """
+    Función para comparar el árbol de nodos y ArraySegmentTreeMaxBP con una carga mixta de reemplazos de caracteres
+    y consultas maxBP intercaladas (la mitad de cada una), e imprimir los tiempos.
+
+    Parámetros:
+    n (int): Longitud de la cadena.
+    ops (int): Cantidad total de operaciones.
+    seed (int): Semilla del generador aleatorio.
+    """
+    rng = random.Random(seed)
+    S = ''.join(rng.choice('()') for _ in range(n))
+    workload = []
+    for _ in range(ops):
+        i, j = sorted((rng.randrange(n), rng.randrange(n)))
+        workload.append((rng.random() < 0.5, i, j, rng.choice('()')))
+
+    node_tree = SegmentTreeSubStringMaxBP(None)
+    node_tree.root = node_tree.build(S, 0, n - 1)
+    trees = [('nodos', node_tree),
+             ('arreglos', SegmentTreeSubStringMaxBP(backend=ArraySegmentTreeMaxBP.from_string(S)))]
+    results = []
+    for name, tree in trees:
+        begin = time.perf_counter()
+        answers = []
+        for is_update, i, j, ch in workload:
+            if is_update:
+                tree.update(i, ch)
+            else:
+                answers.append(tree.maxBP(i, j))
+        elapsed = time.perf_counter() - begin
+        results.append(answers)
+        print(f"{name}: {ops} operaciones en {elapsed:.2f} s ({elapsed / ops * 1e6:.1f} us por operación)")
+    assert results[0] == results[1]
+
+
+def benchmark_queries(n=10 ** 6, queries=10 ** 6, seed=0):
+    """
+    Función para comparar la cantidad de consultas maxBP por segundo del árbol de nodos, ArraySegmentTreeMaxBP y
+    DisjointSparseTableMaxBP sobre una cadena aleatoria, e imprimir los resultados.
+
+    Parámetros:
+    n (int): Longitud de la cadena.
+    queries (int): Cantidad de consultas.
+    seed (int): Semilla del generador aleatorio.
+    """
+    rng = random.Random(seed)
+    S = ''.join(rng.choice('()') for _ in range(n))
+    ranges = [sorted((rng.randrange(n), rng.randrange(n))) for _ in range(queries)]
+
+    node_tree = SegmentTreeSubStringMaxBP(None)
+    node_tree.root = node_tree.build(S, 0, n - 1)
+    trees = [('nodos', node_tree),
+             ('arreglos', SegmentTreeSubStringMaxBP(backend=ArraySegmentTreeMaxBP.from_string(S))),
+             ('tabla dispersa', SegmentTreeSubStringMaxBP(backend=DisjointSparseTableMaxBP.from_string(S)))]
+    results = []
+    for name, tree in trees:
+        begin = time.perf_counter()
+        results.append([tree.maxBP(i, j) for i, j in ranges])
+        elapsed = time.perf_counter() - begin
+        print(f"{name}: {queries / elapsed:,.0f} consultas por segundo")
+    assert results[0] == results[1] == results[2]
+
+
+def benchmark_batch(n=10 ** 6, queries=10 ** 7, seed=0):
+    """
+    Función para medir la cantidad de consultas por segundo de maxBP_batch con ArraySegmentTreeMaxBP y con
+    DisjointSparseTableMaxBP, e imprimir los resultados.
+
+    Parámetros:
+    n (int): Longitud de la cadena.
+    queries (int): Cantidad de consultas.
+    seed (int): Semilla del generador aleatorio.
+    """
+    rng = np.random.default_rng(seed)
+    leaves = rng.integers(0, 2, n, dtype=np.uint8)
+    I, J = np.sort(rng.integers(0, n, (2, queries)), axis=0)
+    results = []
+    for name, backend in [('arreglos', ArraySegmentTreeMaxBP), ('tabla dispersa', DisjointSparseTableMaxBP)]:
+        tree = backend(leaves)
+        begin = time.perf_counter()
+        results.append(tree.maxBP_batch(I, J))
+        elapsed = time.perf_counter() - begin
+        print(f"{name}: {queries / elapsed:,.0f} consultas por segundo")
+    assert np.array_equal(results[0], results[1])
+
+
+if __name__ == "__main__":
+    # Uso: python subcadena-max-bien-parentizada.py [updates | queries | batch]
+    if sys.argv[1:] == ["updates"]:
+        benchmark_updates()
+    elif sys.argv[1:] == ["queries"]:
+        benchmark_queries()
+    elif sys.argv[1:] == ["batch"]:
+        benchmark_batch()
+    else:
+        # Ejemplo de uso
+        S = "())(())(())("
+        tree = SegmentTreeSubStringMaxBP(None)
+        tree.root = tree.build(S, 0, len(S) - 1)
+        result = tree.maxBP(2, 9)
+        print(result)  # Imprime: 6
 
+        # Ejemplo de uso con el árbol en arreglos planos
+        tree = SegmentTreeSubStringMaxBP(backend=ArraySegmentTreeMaxBP.from_string(S))
+        print(tree.maxBP(2, 9))  # Imprime: 6
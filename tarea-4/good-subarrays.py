@@ -1,4 +1,102 @@
-def good_subarrays(a):
+import os
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from math import isqrt
+from multiprocessing import shared_memory
+
+import numpy as np
+
+# Largest number covered by a smallest prime factor sieve (4 MiB as 32-bit integers). Larger elements are factored
+# by trial division, so a single huge element in a stream does not allocate a sieve of its size.
+SIEVE_LIMIT = 1 << 20
+
+
+def sieve(n):
+    """
+    Calculate the Smallest Prime Factor (SPF) for every number till n.
+
+    Parameters:
+    n (int): The upper limit for the calculation of the SPF.
+
+    Returns:
+    array: The SPF array of 32-bit integers, where spf[x] is the smallest prime factor of x (spf[0] = 0 and
+    spf[1] = 1).
+    """
+    # Start with every number as its own smallest prime factor.
+    spf = array('i', range(n + 1))
+
+    # Mark the primes up to sqrt(n), which are the only ones that can be the SPF of a composite number till n.
+    limit = isqrt(n)
+    is_prime = bytearray([1]) * (limit + 1)
+    primes = []
+    for p in range(2, limit + 1):
+        if is_prime[p]:
+            primes.append(p)
+            is_prime[p * p::p] = bytes(len(range(p * p, limit + 1, p)))
+
+    # Assign each prime to its multiples from p*p on, going from the largest prime to the smallest. Every multiple
+    # ends up overwritten by its smallest prime factor, and each prime is a single slice assignment.
+    for p in reversed(primes):
+        spf[p * p::p] = array('i', [p]) * len(range(p * p, n + 1, p))
+
+    # Return the SPF array.
+    return spf
+
+
+def smallest_factor(x, start=2):
+    """
+    Find the smallest prime factor of x by trial division.
+
+    Parameters:
+    x (int): A number greater than 1 with no prime factor smaller than start.
+    start (int): The smallest candidate factor.
+
+    Returns:
+    int: The smallest prime factor of x.
+    """
+    if start <= 2:
+        if x % 2 == 0:
+            return 2
+        start = 3
+    # After 2, only odd candidates can be prime
+    p = start | 1
+    while p * p <= x:
+        if x % p == 0:
+            return p
+        p += 2
+    return x
+
+
+def get_divisors(x, spf):
+    """
+    Get all the divisors of x from its prime factorization, using the smallest prime factor array spf. Once the
+    remaining cofactor no longer fits in spf, its factors are found by trial division.
+
+    Parameters:
+    x (int): A positive number.
+    spf (sequence): The smallest prime factor array.
+
+    Returns:
+    list: The divisors of x, in no particular order.
+    """
+    divisors = [1]
+    p = 2
+    while x > 1:
+        # Extract the largest power p^k of the smallest prime factor that divides x. Factors are found in increasing
+        # order, so trial division can continue from the last one.
+        p = spf[x] if x < len(spf) else smallest_factor(x, p)
+        power = 1
+        powers = []
+        while x % p == 0:
+            x //= p
+            power *= p
+            powers.append(power)
+        # Every divisor found so far can be multiplied by any of the powers of p.
+        divisors += [d * q for q in powers for d in divisors]
+    return divisors
+
+
+def good_subarrays(a, mod=None):
     """
     Calculate the number of good subarrays in the given array.
 
@@ -8,6 +106,264 @@ def good_subarrays(a):
     A subarray is considered good if the subarray is not empty and for all i, such that 1 ≤ i ≤ k,
     it holds that B[i] is divisible by i.
 
+    Only the divisors of a[i] change dp when processing the i-th element, so instead of testing every size d from
+    i + 1 down to 1, the divisors of a[i] are enumerated from its prime factorization with a smallest prime factor
+    sieve over max(a). The work is the sum of the number of divisors of the elements instead of O(n^2).
+
+    Parameters:
+    a (list): The input array. Negative elements are divisible by the same sizes as their absolute values.
+    mod (int): If given, the count is computed modulo mod (at most 2^62) with fixed-width integers.
+
+    Returns:
+    int: The number of good subarrays in the input array, modulo mod if it was given.
+    """
+    # Elements above (n + 1)^2 are never looked up in the sieve (see GoodSubarrayCounter.add), so it is not sized
+    # past that
+    counter = GoodSubarrayCounter(mod, min(max(map(abs, a), default=1), (len(a) + 1) ** 2, SIEVE_LIMIT))
+    counter.extend(a)
+    return counter.total
+
+
+class GoodSubarrayCounter:
+    """
+    Incremental counter of good subarrays that receives the elements one at a time, so arrays that do not fit in
+    memory (or never end) can be processed.
+
+    Attributes
+    ----------
+    mod : int
+        if not None, every count is kept modulo mod in an array('q') instead of as Python big integers
+    dp : list or array
+        dp[i] is the number of good subarrays of size i among the elements seen so far, with dp[0] = 1 counting the
+        empty subarray. It only grows up to the longest good subarray seen, not to the number of elements.
+    total : int
+        the number of good subarrays among the elements seen so far (modulo mod if it was given)
+    spf : array
+        the smallest prime factor sieve, grown up to SIEVE_LIMIT when a larger element with many candidate sizes
+        arrives
+    """
+
+    def __init__(self, mod=None, max_value=1, spf=None):
+        """
+        Constructs the counter with no elements.
+
+        Parameters
+        ----------
+            mod : int
+                if given, counts are computed modulo mod, which must be at most 2^62 so that adding two counts fits
+                in 64 bits
+            max_value : int
+                the largest element expected, used to size the initial sieve (at most SIEVE_LIMIT)
+            spf : sequence
+                an already computed smallest prime factor sieve to use instead of building one
+        """
+        self.mod = mod
+        self.dp = [1] if mod is None else array('q', [1 % mod])
+        self.total = 0
+        self.spf = sieve(min(max_value, SIEVE_LIMIT)) if spf is None else spf
+
+    def add(self, x):
+        """
+        Process the next element of the array.
+
+        Parameters
+        ----------
+            x : int
+                the next element; only its absolute value matters for divisibility
+        """
+        x = abs(x)
+        dp, mod = self.dp, self.mod
+        # A subarray of size d can only end in this element if there are subarrays of size d - 1, so sizes beyond
+        # len(dp) can be skipped. This also keeps d <= i + 1, since dp grows by at most one per element.
+        limit = len(dp)
+        if x == 0:
+            sizes = range(limit, 0, -1)
+        elif len(self.spf) <= x and limit <= isqrt(x):
+            # Testing the few candidate sizes directly is cheaper than factoring an element outside the sieve
+            sizes = [d for d in range(limit, 0, -1) if x % d == 0]
+        else:
+            # Grow the sieve, at least doubling it but never past SIEVE_LIMIT, if the element is larger than any
+            # seen so far. Elements above the limit are factored by trial division in get_divisors.
+            if len(self.spf) <= x and len(self.spf) <= SIEVE_LIMIT:
+                self.spf = sieve(min(max(x, 2 * (len(self.spf) - 1)), SIEVE_LIMIT))
+            sizes = sorted((d for d in get_divisors(x, self.spf) if d <= limit), reverse=True)
+        if sizes and sizes[0] == limit:
+            dp.append(0)
+
+        # For each divisor d (starting from the largest divisor), we can construct subarrays of size d by taking this
+        # element as the last element of each of the subarrays of size d - 1. The largest divisor goes first so that
+        # dp[d - 1] does not include subarrays that already end in this element.
+        added = 0
+        if mod is None:
+            for d in sizes:
+                dp[d] += dp[d - 1]
+                added += dp[d - 1]
+            self.total += added
+        else:
+            for d in sizes:
+                dp[d] = (dp[d] + dp[d - 1]) % mod
+                added += dp[d - 1]
+            self.total = (self.total + added) % mod
+
+    def extend(self, iterable):
+        """
+        Process every element of an iterable, in order.
+
+        Parameters
+        ----------
+            iterable : iterable
+                the next elements of the array
+        """
+        for x in iterable:
+            self.add(x)
+
+
+def read_numbers(path, chunk_size=1 << 20):
+    """
+    Read whitespace-separated integers from a file in fixed-size chunks, so that arbitrarily long lines do not have
+    to fit in memory.
+
+    Parameters:
+    path (str): The path of the file.
+    chunk_size (int): The number of characters read at a time.
+
+    Returns:
+    generator: The integers of the file, in order.
+    """
+    with open(path) as f:
+        rest = ''
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            tokens = (rest + chunk).split()
+            # The last token may continue in the next chunk, unless the chunk ends in whitespace
+            rest = '' if chunk[-1].isspace() else tokens.pop()
+            for token in tokens:
+                yield int(token)
+        if rest:
+            yield int(rest)
+
+
+def read_arrays(path):
+    """
+    Read a file with one array per line, as whitespace-separated integers, into a packed array-of-arrays.
+
+    Parameters:
+    path (str): The path of the file.
+
+    Returns:
+    tuple: (values, offsets), where the k-th array is values[offsets[k]:offsets[k + 1]].
+    """
+    values = array('q')
+    offsets = array('q', [0])
+    with open(path) as f:
+        for line in f:
+            values.extend(map(int, line.split()))
+            offsets.append(len(values))
+    return np.frombuffer(values, dtype=np.int64), np.frombuffer(offsets, dtype=np.int64)
+
+
+# Shared memory blocks and views attached by each worker process of good_subarrays_batch
+worker_state = {}
+
+
+def attach_worker(names, sizes, mod):
+    """
+    Initializer of the worker processes of good_subarrays_batch: attach the shared memory blocks with the values,
+    the offsets and the sieve, without copying them.
+
+    Parameters:
+    names (tuple): The names of the shared memory blocks of the values, the offsets and the sieve.
+    sizes (tuple): The number of elements of each block.
+    mod (int): The modulus passed to good_subarrays_batch.
+    """
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    worker_state['blocks'] = blocks
+    # memoryview indexing returns plain Python integers, which is what get_divisors works with. The sieve holds
+    # 32-bit integers and the rest 64-bit ones.
+    worker_state['values'], worker_state['offsets'], worker_state['spf'] = (
+        block.buf[:array(code).itemsize * size].cast(code) for block, size, code in zip(blocks, sizes, 'qqi'))
+    worker_state['mod'] = mod
+
+
+def count_range(first, last):
+    """
+    Count the good subarrays of the arrays first, ..., last - 1 of the shared packed input.
+
+    Parameters:
+    first (int): The index of the first array.
+    last (int): The index after the last array.
+
+    Returns:
+    list: The number of good subarrays of each array, in order.
+    """
+    values, offsets, spf = worker_state['values'], worker_state['offsets'], worker_state['spf']
+    results = []
+    for k in range(first, last):
+        counter = GoodSubarrayCounter(worker_state['mod'], spf=spf)
+        counter.extend(values[offsets[k]:offsets[k + 1]])
+        results.append(counter.total)
+    return results
+
+
+def good_subarrays_batch(values, offsets=None, mod=None, processes=None):
+    """
+    Count the good subarrays of many arrays with a process pool.
+
+    The packed input and a single smallest prime factor sieve over its largest value (up to SIEVE_LIMIT) are placed
+    in shared memory, so every worker reads them without pickling or copying. The arrays are split into contiguous
+    ranges with about the same number of elements, and the results come back in order.
+
+    Parameters:
+    values (np.ndarray or str): The elements of all the arrays one after another, or the path of a file in the
+    format accepted by read_arrays.
+    offsets (np.ndarray): Array of m + 1 integers; the k-th array is values[offsets[k]:offsets[k + 1]]. Not used if
+    values is a path.
+    mod (int): If given, the counts are computed modulo mod (at most 2^62).
+    processes (int): The number of worker processes. By default, one per core.
+
+    Returns:
+    np.ndarray: The number of good subarrays of each array, as int64 if mod was given and as Python integers
+    otherwise, since the exact counts do not fit in 64 bits.
+    """
+    if isinstance(values, str):
+        values, offsets = read_arrays(values)
+    values = np.ascontiguousarray(values, dtype=np.int64)
+    offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+    m = len(offsets) - 1
+    processes = processes or os.cpu_count() or 1
+
+    spf = np.frombuffer(sieve(min(int(np.abs(values).max(initial=1)), SIEVE_LIMIT)), dtype=np.intc)
+    arrays = [values, offsets, spf]
+    blocks = [shared_memory.SharedMemory(create=True, size=max(a.nbytes, 1)) for a in arrays]
+    try:
+        for block, a in zip(blocks, arrays):
+            np.ndarray(a.shape, dtype=a.dtype, buffer=block.buf)[:] = a
+
+        # Split the arrays into about 4 ranges per process with the same number of elements each
+        tasks = min(m, 4 * processes)
+        bounds = np.searchsorted(offsets, np.linspace(0, offsets[-1], tasks + 1)[1:-1], side='right') - 1
+        bounds = np.unique(np.concatenate(([0], bounds, [m]))).tolist()
+
+        names = tuple(block.name for block in blocks)
+        sizes = tuple(len(a) for a in arrays)
+        with ProcessPoolExecutor(processes, initializer=attach_worker, initargs=(names, sizes, mod)) as pool:
+            parts = pool.map(count_range, bounds[:-1], bounds[1:])
+            results = [count for part in parts for count in part]
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return np.array(results, dtype=np.int64 if mod is not None else object)
+
+
+def good_subarrays_quadratic(a):
+    """
+    Calculate the number of good subarrays in the given array by testing every size d from i + 1 down to 1 for each
+    element, in O(n^2). Kept as a reference for good_subarrays.
+
     Parameters:
     a (list): The input array.
 
@@ -37,6 +393,7 @@ def good_subarrays(a):
     return sum(dp)
 
 
-# Test the function with a sample array
-s = [2, 2, 1, 22, 15]
-print(good_subarrays(s))
+if __name__ == "__main__":
+    # Test the function with a sample array
+    s = [2, 2, 1, 22, 15]
+    print(good_subarrays(s))
@@ -1,17 +1,162 @@
-def is_initialized(a, b, i, cnt):
+import random
+import sys
+import time
+from array import array
+
+
+class VirtualArray:
     """
-    Checks if a given index is initialized in the arrays a and b.
+    Array of n 64-bit integers whose positions start uninitialized, with O(1) reads, writes, membership checks and
+    clear, using the constant-time initialization technique.
 
-    Parameters:
-    a (list): The list of initialized positions.
-    b (list): The list of positions to check.
-    i (int): The index to check.
-    cnt (int): The current count of initialized positions.
+    The values live in t. The positions written since the last clear are a[0], ..., a[cnt - 1], and b[i] is the slot
+    of a where position i was recorded. Position i is initialized if b[i] points to a slot below cnt that points back
+    to i, so clearing only needs to reset cnt, and the garbage left in t, a and b is never trusted.
 
-    Returns:
-    bool: True if the index is initialized, False otherwise.
+    The three buffers are array('q') of n elements, allocated once in the constructor.
     """
-    return 1 <= b[i] <= cnt and a[b[i]] == i
+
+    def __init__(self, n):
+        """
+        Create a virtual array of size n with every position uninitialized.
+
+        Parameters:
+        n (int): The size of the array.
+        """
+        self.n = n
+        self.t = array('q', bytes(8 * n))
+        self.a = array('q', bytes(8 * n))
+        self.b = array('q', bytes(8 * n))
+        self.cnt = 0
+
+    def check(self, i):
+        """
+        Raise an IndexError if i is not a valid position.
+
+        Parameters:
+        i (int): The position to check.
+        """
+        if not 0 <= i < self.n:
+            raise IndexError(f"La posición tiene que estar en el rango [0, {self.n})")
+
+    def __contains__(self, i):
+        """
+        Check if a position is initialized.
+
+        Parameters:
+        i (int): The position to check.
+
+        Returns:
+        bool: True if i is a valid position that was assigned since the last clear, False otherwise.
+        """
+        if not 0 <= i < self.n:
+            return False
+        slot = self.b[i]
+        return 0 <= slot < self.cnt and self.a[slot] == i
+
+    def __getitem__(self, i):
+        """
+        Get the value at a position.
+
+        Parameters:
+        i (int): The position to read.
+
+        Returns:
+        int: The value assigned to i since the last clear.
+
+        Raises:
+        IndexError: If i is not a valid position.
+        KeyError: If i is not initialized.
+        """
+        self.check(i)
+        if i not in self:
+            raise KeyError(i)
+        return self.t[i]
+
+    def __setitem__(self, i, value):
+        """
+        Assign a value to a position, initializing it if needed.
+
+        Parameters:
+        i (int): The position to write.
+        value (int): The value, which must fit in a signed 64-bit integer.
+
+        Raises:
+        IndexError: If i is not a valid position.
+        """
+        self.check(i)
+        self.t[i] = value
+        if i not in self:
+            # Record i in the next free slot; at most n positions can be initialized, so cnt never goes past n - 1
+            self.a[self.cnt] = i
+            self.b[i] = self.cnt
+            self.cnt += 1
+
+    def get(self, i, default=None):
+        """
+        Get the value at a position, or a default if it is not initialized.
+
+        Parameters:
+        i (int): The position to read.
+        default: The value to return if i is not initialized.
+
+        Returns:
+        The value at i, or default.
+        """
+        return self.t[i] if i in self else default
+
+    def clear(self):
+        """
+        Mark every position as uninitialized in O(1), without touching the buffers.
+        """
+        self.cnt = 0
+
+    def __len__(self):
+        """
+        Returns:
+        int: The number of initialized positions.
+        """
+        return self.cnt
+
+
+def benchmark_clear(n=10 ** 7, cycles=20, writes=1000, seed=0):
+    """
+    Compare VirtualArray.clear against reallocating a zeroed list of size n, over repeated cycles of clearing the
+    array and then writing and reading a few random positions, and print the times.
+
+    Parameters:
+    n (int): The size of the array.
+    cycles (int): The number of clear/write cycles.
+    writes (int): The number of random writes (and reads) per cycle.
+    seed (int): The seed of the random number generator.
+    """
+    rng = random.Random(seed)
+    workload = [[(rng.randrange(n), rng.randrange(1 << 32)) for _ in range(writes)] for _ in range(cycles)]
+
+    begin = time.perf_counter()
+    t = [0] * n
+    list_total = 0
+    for cycle in workload:
+        t = [0] * n
+        for pos, val in cycle:
+            t[pos] = val
+        list_total += sum(t[pos] for pos, _ in cycle)
+    list_elapsed = time.perf_counter() - begin
+
+    begin = time.perf_counter()
+    v = VirtualArray(n)
+    virtual_total = 0
+    for cycle in workload:
+        v.clear()
+        for pos, val in cycle:
+            v[pos] = val
+        virtual_total += sum(v[pos] for pos, _ in cycle)
+    virtual_elapsed = time.perf_counter() - begin
+
+    assert list_total == virtual_total
+    print(f"[0] * n: {cycles} ciclos en {list_elapsed:.2f} s ({list_elapsed / cycles * 1e3:.1f} ms por ciclo)")
+    print(f"VirtualArray: {cycles} ciclos en {virtual_elapsed:.2f} s ({virtual_elapsed / cycles * 1e3:.1f} ms por "
+          f"ciclo, incluyendo la reserva inicial)")
 
 
 def main():
@@ -27,13 +172,8 @@ def main():
     # Get the size of the array from the user
     n = int(input("Ingrese el tamaño del arreglo a utilizar: "))
 
-    # Initialize the arrays with zeros
-    t = [0] * n
-    a = [0] * n
-    b = [0] * n
-
-    # Initialize the counter
-    cnt = 0
+    # Create the virtual array, with every position uninitialized
+    v = VirtualArray(n)
 
     # Start an infinite loop to handle user commands
     while True:
@@ -53,14 +193,8 @@ def main():
             if pos < 0 or pos >= n:
                 print(f"La posición a consultar tiene que estar en el rango [0, {n})")
             else:
-                # Assign val to t[pos]
-                t[pos] = val
-
-                # If cnt is 0 or the position is not initialized, increment cnt and update a and b
-                if cnt == 0 or not is_initialized(a, b, pos, cnt):
-                    cnt += 1
-                    b[pos] = cnt
-                    a[cnt] = pos
+                # Assign val to the position, initializing it if needed
+                v[pos] = val
 
         # If the command is "CONSULTAR" and there is exactly one additional word
         elif instruction[0] == "CONSULTAR" and len(instruction) == 2:
@@ -71,16 +205,16 @@ def main():
             if pos < 0 or pos >= n:
                 print(f"La posición a consultar tiene que estar en el rango [0, {n})")
             else:
-                # If cnt is 0 or the position is not initialized, print a message
-                if cnt == 0 or not is_initialized(a, b, pos, cnt):
+                # If the position is not initialized, print a message
+                if pos not in v:
                     print("Posicion sin inicializar")
                 else:
-                    # Print the value at t[pos]
-                    print(f"El valor en la posición {pos} es {t[pos]}")
+                    # Print the value at the position
+                    print(f"El valor en la posición {pos} es {v[pos]}")
 
-        # If the command is "LIMPIAR" and there are no additional words, reset cnt
+        # If the command is "LIMPIAR" and there are no additional words, clear the array
         elif instruction[0] == "LIMPIAR" and len(instruction) == 1:
-            cnt = 0
+            v.clear()
 
         # If the command is not recognized, print an error message
         else:
@@ -90,6 +224,9 @@ def main():
 
 if __name__ == "__main__":
     """
-    Entry point of the program. Calls the main function.
+    Entry point of the program. Calls the benchmark with "benchmark" as argument, and the main function otherwise.
     """
-    main()
+    if sys.argv[1:] == ["benchmark"]:
+        benchmark_clear()
+    else:
+        main()